@@ -1,41 +1,95 @@
 """AI-powered data analyzer using LLMs."""
 
 import os
+import asyncio
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 import yaml
-import json
+import orjson
 import base64
-from typing import Dict, List, Any, Optional, Union
+import uuid
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 from datetime import datetime, date
 import time
 import pandas as pd
 import polars as pl
-from huggingface_hub import HfApi, login, hf_hub_download
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from src.analysis.profiling import generate_profile_report
 
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
-from ctransformers import AutoModelForCausalLM as CTAutoModelForCausalLM
-
 # Configure logging
 log_dir = Path(__file__).parent.parent / 'logs'
 log_dir.mkdir(exist_ok=True)
 log_file = log_dir / 'ai_analysis.log'
 
+# Records are handed to a background listener thread so file writes never
+# block the analysis path
+log_queue = queue.Queue(maxsize=10000)
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+file_handler = logging.FileHandler(log_file)
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)]
+)
+
+log_listener = logging.handlers.QueueListener(
+    log_queue, file_handler, stream_handler, respect_handler_level=True
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
 from src.analysis import DataAnalyzer
 
+# Attempts made per analysis request, and seconds before a stalled request is abandoned
+MAX_RETRIES = 3
+REQUEST_TIMEOUT = 30
+
+def _backoff_delays() -> Iterator[Optional[int]]:
+    """Yield the exponential backoff before each retry, then None for the last attempt."""
+    for retry in range(MAX_RETRIES - 1):
+        yield 2 ** retry
+    yield None
+
+# Static parts of the analysis prompt
+_PROMPT_HEADER = "<s>[INST] You are a data analysis expert. Please analyze this dataset:\n"
+
+_PROMPT_FOOTER = """\nPlease provide a detailed analysis in JSON format with the following sections:
+
+1. key_findings: Important patterns, trends, or anomalies
+   - Look for correlations between variables
+   - Identify any unusual patterns or outliers
+   - Note any significant trends or seasonality
+
+2. data_quality: Assessment of data quality and reliability
+   - Evaluate completeness and accuracy
+   - Identify potential data collection issues
+   - Suggest data quality improvements
+
+3. recommendations: Actionable suggestions
+   - Business process improvements
+   - Data collection enhancements
+   - Potential areas for further investigation
+
+4. potential_use_cases: Practical applications of this data
+   - Business intelligence opportunities
+   - Automation possibilities
+   - Decision support scenarios
+
+Keep your responses concise and focused on insights that can drive action or decisions.
+
+Format your response as a valid JSON object with these exact keys: key_findings, data_quality, recommendations, potential_use_cases[/INST]</s>"""
+
 class AIAnalyzer:
     """AI-powered data analyzer using local LLMs."""
     
@@ -54,6 +108,17 @@ class AIAnalyzer:
             self.api_url = api_url
             self.username = username
             self.password = password
+            self.hf_token = None
+            self._reports_dir = os.path.join(os.getcwd(), "reports")
+            self._set_auth_headers()
+            
+            # Reuse pooled keep-alive connections for all API calls; retries
+            # are handled by analyze_dataframe's own backoff loop
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(total=0))
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+            self._async_client = None
             
             # Load HuggingFace credentials
             config_path = Path(__file__).parent.parent / 'config' / 'api_keys.yaml'
@@ -66,6 +131,7 @@ class AIAnalyzer:
                     self.username = username or hf_config.get('username')
                     self.password = password or hf_config.get('password')
                     self.api_url = api_url or hf_config.get('api_url')
+                    self._set_auth_headers()
                     
                     if self.username and self.password:
                         try:
@@ -74,28 +140,38 @@ class AIAnalyzer:
                                 # Custom API authentication logic here
                                 logger.info(f"Using custom API URL: {self.api_url}")
                                 # You can implement custom API auth here
-                                auth = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
-                                headers = {
-                                    "Authorization": f"Basic {auth}"
-                                }
-                                response = requests.get(self.api_url, headers=headers)
+                                response = self._session.get(
+                                    self.api_url, headers={"Authorization": self._auth_header}
+                                )
                                 if response.status_code == 200:
                                     logger.info("Successfully authenticated with custom API")
                                 else:
                                     logger.error("Failed to authenticate with custom API")
+                                
+                                # Analysis goes through the custom API, so no
+                                # HuggingFace token is needed
+                                self.hf_token = os.environ.get('HUGGING_FACE_HUB_TOKEN')
                             else:
-                                # Default HuggingFace login
-                                login(username=self.username, password=self.password)
-                                logger.info(f"Successfully logged in to HuggingFace as {self.username}")
-                            
-                            # Get API token after login
-                            api = HfApi()
-                            self.hf_token = api.get_token()
-                            if self.hf_token:
-                                os.environ['HUGGING_FACE_HUB_TOKEN'] = self.hf_token
-                                logger.info("Retrieved and set HuggingFace token")
-                            else:
-                                logger.warning("Could not retrieve HuggingFace token after login")
+                                from huggingface_hub import get_token, login
+                                
+                                # Reuse an existing token instead of logging in again
+                                # get_token checks HF_TOKEN, HUGGING_FACE_HUB_TOKEN and the stored token
+                                self.hf_token = get_token()
+                                if self.hf_token:
+                                    logger.info("Using existing HuggingFace token")
+                                else:
+                                    # Default HuggingFace login
+                                    login(username=self.username, password=self.password)
+                                    logger.info(f"Successfully logged in to HuggingFace as {self.username}")
+                                    
+                                    # Get API token after login
+                                    self.hf_token = get_token()
+                                
+                                if self.hf_token:
+                                    os.environ['HUGGING_FACE_HUB_TOKEN'] = self.hf_token
+                                    logger.info("Retrieved and set HuggingFace token")
+                                else:
+                                    logger.warning("Could not retrieve HuggingFace token after login")
                         except Exception as e:
                             logger.error(f"Failed to login: {e}")
                             self.hf_token = None
@@ -107,7 +183,6 @@ class AIAnalyzer:
             self.data_analyzer = DataAnalyzer()
             
             logger.info("Model initialized successfully")
-            logger.info("Model initialized successfully")
             
         except Exception as e:
             logger.error(f"Error initializing AIAnalyzer: {str(e)}")
@@ -115,6 +190,121 @@ class AIAnalyzer:
             self.model = None
             self.tokenizer = None
 
+    def _set_auth_headers(self) -> None:
+        """Cache the Basic auth headers for the current credentials."""
+        if self.username and self.password:
+            token = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+            self._auth_header = f"Basic {token}"
+            self._json_headers = {
+                "Authorization": self._auth_header,
+                "Content-Type": "application/json"
+            }
+        else:
+            self._auth_header = None
+            self._json_headers = None
+
+    def _prepare_analysis(self, df: Union[pd.DataFrame, pl.DataFrame],
+                          context: Optional[Dict] = None) -> Tuple[Dict, Optional[str], str]:
+        """Profile the DataFrame, compute quality metrics and build the prompt.
+        
+        Returns:
+            Tuple of (quality analysis, profile report path, prompt)
+        """
+        # Verify authentication if using custom API
+        if self.api_url and not (self.username and self.password):
+            raise ValueError("Username and password required for custom API URL")
+        
+        # Generate data profile report first
+        try:
+            # The profiler works on pandas; quality analysis below takes
+            # Polars frames as-is
+            report_df = df.to_pandas() if isinstance(df, pl.DataFrame) else df
+            # Each analysis gets its own file so concurrent runs never share one
+            report_path = generate_profile_report(
+                report_df, 
+                output_dir=self._reports_dir,
+                title=f"Data Profile Report - {len(df)} rows",
+                filename=f"profile_report_{uuid.uuid4().hex}.html"
+            )
+            logger.info(f"Generated profile report at: {report_path}")
+        except Exception as e:
+            logger.warning(f"Could not generate profile report: {e}")
+            report_path = None
+        
+        # Get statistics using DataAnalyzer
+        logger.info("Computing data quality metrics using DataAnalyzer...")
+        quality_analysis = self.data_analyzer.analyze_data_quality(df)
+        
+        # Add report path to context if available
+        if report_path:
+            if context is None:
+                context = {}
+            context["profile_report_path"] = report_path
+        
+        # Add authentication context
+        auth_context = {
+            "api_url": self.api_url,
+            "username": self.username,
+            "authenticated": bool(self.username and self.password)
+        }
+        if context is None:
+            context = {}
+        context.update({"auth": auth_context})
+        
+        # Generate prompt for GPT
+        logger.info("Building analysis prompt...")
+        prompt = self._build_analysis_prompt(df, quality_analysis, context)
+        logger.debug("Generated prompt: %s...", prompt[:200])  # Log first 200 chars of prompt
+        
+        return quality_analysis, report_path, prompt
+
+    def _parse_insights(self, response_content: Any, quality_analysis: Dict,
+                        report_path: Optional[str]) -> Dict:
+        """Parse the API response and combine it with the DataAnalyzer metrics.
+        
+        Raises:
+            orjson.JSONDecodeError: If the response is not valid JSON
+        """
+        if isinstance(response_content, str):
+            insights = orjson.loads(response_content)
+        else:
+            insights = response_content
+        
+        # Combine DataAnalyzer metrics with AI insights
+        insights.update({
+            "data_quality_metrics": quality_analysis.get("quality_metrics", {}),
+            "column_statistics": quality_analysis.get("column_statistics", {}),
+            "profile_report_path": report_path if report_path else None
+        })
+        return insights
+
+    def _request_body(self, prompt: str) -> bytes:
+        """Serialize the analysis request for the custom API."""
+        return orjson.dumps({
+            "prompt": prompt,
+            "max_tokens": 1000
+        })
+
+    def _insights_from_response(self, response: Any, quality_analysis: Dict,
+                                report_path: Optional[str]) -> Dict:
+        """Parse an API response into insights, raising if it is unusable."""
+        if response.status_code != 200:
+            raise Exception(f"API request failed with status {response.status_code}")
+        return self._parse_insights(orjson.loads(response.content), quality_analysis, report_path)
+
+    @staticmethod
+    def _failed_request(error: Exception) -> Dict:
+        """Build the result returned once every attempt has failed."""
+        if isinstance(error, orjson.JSONDecodeError):
+            return {
+                "error": "Invalid response format",
+                "message": "Failed to parse response as JSON"
+            }
+        return {
+            "error": "Request failed",
+            "message": str(error)
+        }
+
     def analyze_dataframe(self, df: Union[pd.DataFrame, pl.DataFrame], context: Optional[Dict] = None) -> Dict:
         """Analyze DataFrame using GPT for insights.
         
@@ -124,126 +314,101 @@ class AIAnalyzer:
         """
         try:
             logger.info("Starting DataFrame analysis...")
+            quality_analysis, report_path, prompt = self._prepare_analysis(df, context)
+            if not self.api_url:
+                return self._failed_request(Exception("No API URL configured for AI analysis"))
             
-            # Verify authentication if using custom API
-            if self.api_url and not (self.username and self.password):
-                raise ValueError("Username and password required for custom API URL")
-            
-            # Convert polars DataFrame to pandas if needed
-            if isinstance(df, pl.DataFrame):
-                logger.info("Converting polars DataFrame to pandas...")
-                df = df.to_pandas()
-            
-            # Generate data profile report first
-            try:
-                output_dir = os.path.join(os.getcwd(), "reports")
-                report_path = generate_profile_report(
-                    df, 
-                    output_dir=output_dir,
-                    title=f"Data Profile Report - {len(df)} rows"
-                )
-                logger.info(f"Generated profile report at: {report_path}")
-            except Exception as e:
-                logger.warning(f"Could not generate profile report: {e}")
-                report_path = None
-            
-            # Get statistics using DataAnalyzer
-            logger.info("Computing data quality metrics using DataAnalyzer...")
-            quality_analysis = self.data_analyzer.analyze_data_quality(df)
-            
-            # Add report path to context if available
-            if report_path:
-                if context is None:
-                    context = {}
-                context["profile_report_path"] = report_path
+            body = self._request_body(prompt)
+            for attempt, delay in enumerate(_backoff_delays(), 1):
+                try:
+                    logger.info(f"Requesting insights from GPT (attempt {attempt}/{MAX_RETRIES})...")
+                    response = self._session.post(
+                        self.api_url, headers=self._json_headers, data=body, timeout=REQUEST_TIMEOUT
+                    )
+                    return self._insights_from_response(response, quality_analysis, report_path)
+                except Exception as e:
+                    logger.error(f"Error during request (attempt {attempt}): {str(e)}")
+                    if delay is None:
+                        return self._failed_request(e)
+                    time.sleep(delay)
             
-            # Add authentication context
-            auth_context = {
-                "api_url": self.api_url,
-                "username": self.username,
-                "authenticated": bool(self.username and self.password)
+        except Exception as e:
+            logger.error(f"Error in analyze_dataframe: {str(e)}")
+            logger.exception("Full stack trace:")
+            return {
+                "error": "Analysis failed",
+                "message": str(e)
             }
-            if context is None:
-                context = {}
-            context.update({"auth": auth_context})
-            
-            # Generate prompt for GPT
-            logger.info("Building analysis prompt...")
-            prompt = self._build_analysis_prompt(df, quality_analysis, context)
-            logger.info(f"Generated prompt: {prompt[:200]}...")  # Log first 200 chars of prompt
-            
-            # Initialize variables for retry logic
-            max_retries = 3
-            insights = None
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP/2 client used by the async analysis path."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(http2=True, timeout=REQUEST_TIMEOUT)
+        return self._async_client
+
+    async def analyze_dataframe_async(self, df: Union[pd.DataFrame, pl.DataFrame],
+                                      context: Optional[Dict] = None) -> Dict:
+        """Async variant of analyze_dataframe.
+        
+        Profiling and quality analysis run in a worker thread, and the API
+        request and retry backoff are awaited so other analyses can proceed
+        on the same event loop.
+        
+        Args:
+            df: Input DataFrame (either pandas or polars)
+            context: Optional context dictionary with metadata
+        """
+        try:
+            logger.info("Starting DataFrame analysis...")
+            quality_analysis, report_path, prompt = await asyncio.to_thread(
+                self._prepare_analysis, df, context
+            )
+            if not self.api_url:
+                return self._failed_request(Exception("No API URL configured for AI analysis"))
             
-            for retry in range(max_retries):
+            body = self._request_body(prompt)
+            for attempt, delay in enumerate(_backoff_delays(), 1):
                 try:
-                    # Get insights from GPT
-                    logger.info(f"Requesting insights from GPT (attempt {retry + 1}/{max_retries})...")
-                    
-                    if self.api_url:
-                        # Use custom API with Base64 authentication
-                        auth = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
-                        headers = {
-                            "Authorization": f"Basic {auth}",
-                            "Content-Type": "application/json"
-                        }
-                        
-                        payload = {
-                            "prompt": prompt,
-                            "max_tokens": 1000
-                        }
-                        
-                        response = requests.post(self.api_url, headers=headers, json=payload)
-                        if response.status_code == 200:
-                            response_content = response.json()
-                        else:
-                            raise Exception(f"API request failed with status {response.status_code}")
-                    else:
-                        # No API URL configured
-                        raise Exception("No API URL configured for AI analysis")
-                    
-                    # Parse response
-                    try:
-                        if isinstance(response_content, str):
-                            insights = json.loads(response_content)
-                        else:
-                            insights = response_content
-                        
-                        # Combine DataAnalyzer metrics with AI insights
-                        insights.update({
-                            "data_quality_metrics": quality_analysis.get("quality_metrics", {}),
-                            "column_statistics": quality_analysis.get("column_statistics", {}),
-                            "profile_report_path": report_path if report_path else None
-                        })
-                        break  # If successful, break retry loop
-                    except json.JSONDecodeError:
-                        logger.warning("Failed to parse response as JSON")
-                        if retry == max_retries - 1:  # Last retry
-                            insights = {
-                                "error": "Invalid response format",
-                                "message": "Failed to parse response as JSON"
-                            }
-                
+                    logger.info(f"Requesting insights from GPT (attempt {attempt}/{MAX_RETRIES})...")
+                    response = await self._get_async_client().post(
+                        self.api_url, headers=self._json_headers, content=body
+                    )
+                    return self._insights_from_response(response, quality_analysis, report_path)
                 except Exception as e:
-                    logger.error(f"Error during request (attempt {retry + 1}): {str(e)}")
-                    if retry == max_retries - 1:  # Last retry
-                        insights = {
-                            "error": "Request failed",
-                            "message": str(e)
-                        }
-                    time.sleep(2 ** retry)  # Exponential backoff
-            
-            return insights
+                    logger.error(f"Error during request (attempt {attempt}): {str(e)}")
+                    if delay is None:
+                        return self._failed_request(e)
+                    await asyncio.sleep(delay)
             
         except Exception as e:
-            logger.error(f"Error in analyze_dataframe: {str(e)}")
+            logger.error(f"Error in analyze_dataframe_async: {str(e)}")
             logger.exception("Full stack trace:")
             return {
                 "error": "Analysis failed",
                 "message": str(e)
             }
 
+    async def analyze_dataframes_async(self, dfs: List[Union[pd.DataFrame, pl.DataFrame]],
+                                       contexts: Optional[List[Optional[Dict]]] = None) -> List[Dict]:
+        """Analyze several DataFrames concurrently.
+        
+        Args:
+            dfs: Input DataFrames (either pandas or polars)
+            contexts: Optional context dictionaries, one per DataFrame
+        """
+        if contexts is None:
+            contexts = [None] * len(dfs)
+        return await asyncio.gather(*[
+            self.analyze_dataframe_async(df, context=context)
+            for df, context in zip(dfs, contexts)
+        ])
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client if one was created."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def _build_analysis_prompt(self, df: pd.DataFrame, quality_analysis: Dict, context: Optional[Dict[str, Any]] = None) -> str:
         """Build a prompt for GPT analysis."""
         # Add authentication header if using custom API
@@ -257,71 +422,54 @@ Authentication Context:
 
 """
 
-        prompt = f"""<s>[INST] You are a data analysis expert. Please analyze this dataset:
-{auth_header}
+        parts = [_PROMPT_HEADER, f"""{auth_header}
 Dataset Summary:
 - Total rows: {len(df)}
 - Total columns: {len(df.columns)}
 
 Data Quality Overview:
-"""
+"""]
         # Add quality metrics
         for metric, value in quality_analysis.get('quality_metrics', {}).items():
-            prompt += f"- {metric}: {value}\n"
+            parts.append(f"- {metric}: {value}\n")
 
-        prompt += "\nColumn Analysis:\n"
+        parts.append("\nColumn Analysis:\n")
         for col, stats in quality_analysis.get('column_statistics', {}).items():
-            prompt += f"\n{col}:\n"
+            parts.append(f"\n{col}:\n")
             # Add basic stats
             null_count = stats.get('null_count', 0)
             unique_count = stats.get('unique_count', 0)
-            prompt += f"- Unique values: {unique_count}\n"
-            prompt += f"- Missing values: {null_count}\n"
+            parts.append(f"- Unique values: {unique_count}\n")
+            parts.append(f"- Missing values: {null_count}\n")
             
             # Add numeric stats if available
+            mean = stats.get('mean')
             if 'mean' in stats:
-                prompt += f"- Stats: mean={stats['mean']}, std={stats.get('std', 'N/A')}\n"
-                prompt += f"- Range: [{stats.get('min', 'N/A')} to {stats.get('max', 'N/A')}]\n"
+                parts.append(f"- Stats: mean={mean}, std={stats.get('std', 'N/A')}\n")
+                parts.append(f"- Range: [{stats.get('min', 'N/A')} to {stats.get('max', 'N/A')}]\n")
             
             # Add value distribution if available
-            if 'value_counts' in stats and stats['value_counts']:
-                top_values = stats['value_counts'][:3]
-                prompt += f"- Top values: {', '.join(str(v) for v in top_values)}\n"
+            value_counts = stats.get('value_counts')
+            if value_counts:
+                top_values = value_counts[:3]
+                parts.append(f"- Top values: {', '.join(str(v) for v in top_values)}\n")
         
         # Add context if provided
         if context:
-            prompt += "\nAdditional Context:\n"
+            parts.append("\nAdditional Context:\n")
             for key, value in context.items():
-                prompt += f"{key}: {value}\n"
+                parts.append(f"{key}: {value}\n")
         
         # Add specific analysis requests
-        prompt += """\nPlease provide a detailed analysis in JSON format with the following sections:
-
-1. key_findings: Important patterns, trends, or anomalies
-   - Look for correlations between variables
-   - Identify any unusual patterns or outliers
-   - Note any significant trends or seasonality
-
-2. data_quality: Assessment of data quality and reliability
-   - Evaluate completeness and accuracy
-   - Identify potential data collection issues
-   - Suggest data quality improvements
-
-3. recommendations: Actionable suggestions
-   - Business process improvements
-   - Data collection enhancements
-   - Potential areas for further investigation
-
-4. potential_use_cases: Practical applications of this data
-   - Business intelligence opportunities
-   - Automation possibilities
-   - Decision support scenarios
-
-Keep your responses concise and focused on insights that can drive action or decisions.
-
-Format your response as a valid JSON object with these exact keys: key_findings, data_quality, recommendations, potential_use_cases[/INST]</s>"""
+        parts.append(_PROMPT_FOOTER)
         
-        return prompt
+        return "".join(parts)
+
+_ai_analyzer: Optional[AIAnalyzer] = None
 
-# Create global instance
-ai_analyzer = AIAnalyzer()
\ No newline at end of file
+def get_ai_analyzer() -> AIAnalyzer:
+    """Return the shared AIAnalyzer, creating it on first use."""
+    global _ai_analyzer
+    if _ai_analyzer is None:
+        _ai_analyzer = AIAnalyzer()
+    return _ai_analyzer
\ No newline at end of file
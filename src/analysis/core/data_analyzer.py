@@ -3,53 +3,78 @@
 import pandas as pd
 import polars as pl
 import gc
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Union
 from logging import getLogger
 
-from ..utils.type_converters import convert_polars_types
-from ..utils.data_transformers import flatten_json, to_polars, optimize_dtypes
-from ..processors.stats_processor import compute_stats, detect_quality_issues
+from ..utils.data_transformers import flatten_json, to_polars
+from ..processors.stats_processor import (
+    compute_stats, compute_numeric_stats, detect_quality_issues, format_value_counts,
+    top_values_expr
+)
 from ...validation import validate_data
 
 logger = getLogger(__name__)
 
+NUMERIC_DTYPES = frozenset({
+    pl.Int8, pl.Int16, pl.Int32, pl.Int64,
+    pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64,
+    pl.Float32, pl.Float64
+})
+
+# Substrings identifying numeric source (pandas or SQL) type names
+NUMERIC_TYPE_TOKENS = ('int', 'float', 'decimal', 'numeric')
+
+def numeric_columns_from_dtypes(dtypes: Dict[str, Any]) -> Set[str]:
+    """Return the columns whose source dtype name denotes a numeric type."""
+    numeric_cols = set()
+    for col, dtype in dtypes.items():
+        type_name = str(dtype).lower()
+        if any(token in type_name for token in NUMERIC_TYPE_TOKENS):
+            numeric_cols.add(col)
+    return numeric_cols
+
 class DataAnalyzer:
-    def __init__(self, sample_size: int = 100000, chunk_size: int = 50000):
+    def __init__(self, sample_size: int = 100000, chunk_size: int = 50000,
+                 single_pass_rows: int = 2_000_000, single_pass_bytes: int = 512 * 1024 * 1024):
         """Initialize DataAnalyzer with configurable sampling and chunking.
         
         Args:
             sample_size: Number of rows to sample for initial analysis (default: 100k)
             chunk_size: Size of chunks for processing large datasets (default: 50k)
+            single_pass_rows: Datasets with at most this many rows are analyzed in one pass (default: 2M)
+            single_pass_bytes: Datasets smaller than this in memory are analyzed in one pass (default: 512MB)
         """
         self.logger = getLogger(__name__)
         self.sample_size = sample_size
         self.chunk_size = chunk_size
+        self.single_pass_rows = single_pass_rows
+        self.single_pass_bytes = single_pass_bytes
 
-    def _process_chunk(self, data: pd.DataFrame, start_idx: int, end_idx: int) -> Dict:
+    def _process_chunk(self, pl_data: pl.DataFrame, start_idx: int, length: int,
+                       numeric_source_cols: Set[str],
+                       unique_counts: Optional[Dict[str, int]] = None) -> Dict:
         """Process a single chunk of data."""
         try:
-            # Get chunk of data
-            chunk = data.iloc[start_idx:end_idx].copy()
-            
-            # Convert to Polars for efficient processing
-            pl_chunk = to_polars(chunk)
+            # Zero-copy view over the Arrow buffers of the converted frame
+            pl_chunk = pl_data.slice(start_idx, length)
             
             # Analyze chunk
-            result = self._analyze_chunk(pl_chunk, data.dtypes.to_dict())
-            
-            # Clean up memory
-            del chunk
-            del pl_chunk
-            gc.collect()
-            
-            return result
+            return self._analyze_chunk(pl_chunk, numeric_source_cols, unique_counts)
         except Exception as e:
             logger.error(f"Error processing chunk: {e}")
             return None
 
-    def _analyze_chunk(self, pl_data: pl.DataFrame, original_dtypes: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze a chunk of data."""
+    def _analyze_chunk(self, pl_data: pl.DataFrame, numeric_source_cols: Set[str],
+                       unique_counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Analyze a chunk of data.
+        
+        Args:
+            pl_data: Chunk to analyze
+            numeric_source_cols: Columns whose source dtype is numeric
+            unique_counts: Dataset-wide unique counts; unique values are not
+                additive across chunks, so chunked callers pass these in
+                rather than counting per chunk
+        """
         metrics = {
             "schema_info": {
                 "numeric_columns": [],
@@ -64,32 +89,63 @@ class DataAnalyzer:
             "data_quality_issues": []
         }
         
-        # Identify column types
-        for col in pl_data.columns:
-            col_series = pl_data[col]
-            # Check Polars dtype first
-            if col_series.dtype in [pl.Int64, pl.Int32, pl.Float64, pl.Float32]:
-                metrics["schema_info"]["numeric_columns"].append(col)
-            elif col_series.dtype == pl.Datetime:
-                # Check if any values have time components
-                sample_vals = col_series.drop_nulls().head(10).dt.strftime("%H:%M:%S").to_list()
-                has_time = any(t != "00:00:00" for t in sample_vals)
-                if has_time:
-                    metrics["schema_info"]["datetime_columns"].append(col)
-                else:
-                    metrics["schema_info"]["date_columns"].append(col)
-            elif col_series.dtype == pl.Date:
-                metrics["schema_info"]["date_columns"].append(col)
+        # Null counts, unique counts and top values for every column, collected
+        # as one Polars plan so the Rust engine parallelizes across columns
+        lazy_data = pl_data.lazy()
+        plans = [
+            lazy_data.select(pl.all().null_count()),
+            lazy_data.select([top_values_expr(col, dtype) for col, dtype in pl_data.schema.items()])
+        ]
+        if unique_counts is None:
+            plans.append(lazy_data.select(pl.all().n_unique()))
+        frames = pl.collect_all(plans)
+        null_counts = frames[0].row(0, named=True)
+        top_values = frames[1].row(0, named=True)
+        if unique_counts is None:
+            unique_counts = frames[2].row(0, named=True)
+        
+        # Identify column types in a single pass over the schema
+        schema_info = metrics["schema_info"]
+        datetime_cols = []
+        for col, dtype in pl_data.schema.items():
+            base_type = dtype.base_type()
+            if base_type in NUMERIC_DTYPES:
+                schema_info["numeric_columns"].append(col)
+            elif base_type == pl.Datetime:
+                datetime_cols.append(col)
+            elif base_type == pl.Date:
+                schema_info["date_columns"].append(col)
             else:
                 # Check original SQL type for numeric columns
-                sql_type = str(original_dtypes.get(col, '')).lower()
-                if any(t in sql_type for t in ['int', 'float', 'decimal', 'numeric']):
-                    metrics["schema_info"]["numeric_columns"].append(col)
+                if col in numeric_source_cols:
+                    schema_info["numeric_columns"].append(col)
                 else:
-                    metrics["schema_info"]["string_columns"].append(col)
-            
+                    schema_info["string_columns"].append(col)
+        
+        # Check all datetime columns for time components in one Polars call
+        if datetime_cols:
+            seconds_of_day = pl_data.select([
+                (
+                    pl.col(col).dt.hour().cast(pl.Int32) * 3600
+                    + pl.col(col).dt.minute().cast(pl.Int32) * 60
+                    + pl.col(col).dt.second().cast(pl.Int32)
+                ).max().alias(col)
+                for col in datetime_cols
+            ]).row(0, named=True)
+            for col in datetime_cols:
+                if seconds_of_day[col]:
+                    schema_info["datetime_columns"].append(col)
+                else:
+                    schema_info["date_columns"].append(col)
+        
+        for col in pl_data.columns:
             # Compute optimized statistics
-            metrics["column_stats"][col] = compute_stats(pl_data[col])
+            metrics["column_stats"][col] = compute_stats(
+                pl_data[col],
+                null_count=null_counts[col],
+                unique_count=unique_counts[col],
+                top_values=top_values[col]
+            )
         
         return metrics
 
@@ -98,6 +154,15 @@ class DataAnalyzer:
         if not chunk_metrics:
             return {}
         
+        # A single chunk already holds the final metrics
+        if len(chunk_metrics) == 1:
+            metrics = chunk_metrics[0]
+            column_stats = metrics.get("column_stats", {})
+            first_stats = next(iter(column_stats.values()), {})
+            metrics.setdefault("total_rows", first_stats.get("total_rows", 0))
+            metrics.setdefault("total_columns", len(column_stats))
+            return metrics
+        
         # Start with a clean combined metrics structure
         combined = {
             "total_rows": sum(m.get("total_rows", 0) for m in chunk_metrics),
@@ -130,47 +195,117 @@ class DataAnalyzer:
                         chunk.get("schema_info", {}).get(category, [])
                     ))
         
-        # Get all unique column names from all chunks
-        all_columns = set()
+        # The first chunk containing a column provides its base stats
+        base_stats = {}
         for chunk in chunk_metrics:
-            all_columns.update(chunk.get("column_stats", {}).keys())
+            for col, col_stats in chunk.get("column_stats", {}).items():
+                base_stats.setdefault(col, col_stats)
+        if not base_stats:
+            return combined
+        
+        # Sum row and null counts across chunks with a single group_by. unique_count
+        # is not additive and already holds the dataset-wide estimate.
+        counts = pl.DataFrame(
+            [
+                (col, col_stats.get("total_rows", 0), col_stats.get("null_count", 0))
+                for chunk in chunk_metrics
+                for col, col_stats in chunk.get("column_stats", {}).items()
+            ],
+            schema=[("column", pl.Utf8), ("total_rows", pl.Int64), ("null_count", pl.Int64)],
+            orient="row"
+        ).group_by("column", maintain_order=True).agg(
+            pl.col("total_rows").sum(),
+            pl.col("null_count").sum()
+        )
         
-        # Process each column
-        for col in all_columns:
-            # Get all non-null stats for this column from chunks
-            col_chunks = [
-                chunk["column_stats"][col] for chunk in chunk_metrics 
-                if col in chunk.get("column_stats", {})
-            ]
+        for col, total, null_count in counts.iter_rows():
+            col_stats = base_stats[col]
+            col_stats["total_rows"] = total
+            col_stats["null_count"] = null_count
+            combined["column_stats"][col] = col_stats
             
-            if col_chunks:
-                # Use the first chunk's stats as base
-                combined["column_stats"][col] = col_chunks[0]
-                
-                # Update counts by summing across chunks
-                combined["column_stats"][col].update({
-                    "total_rows": sum(c.get("total_rows", 0) for c in col_chunks),
-                    "null_count": sum(c.get("null_count", 0) for c in col_chunks),
-                    "unique_count": sum(c.get("unique_count", 0) for c in col_chunks)
-                })
-                
-                # Recalculate percentages
-                total = combined["column_stats"][col]["total_rows"]
-                null_count = combined["column_stats"][col]["null_count"]
-                unique_count = combined["column_stats"][col]["unique_count"]
-                
-                if total > 0:
-                    combined["column_stats"][col]["null_percentage"] = round((null_count / total * 100), 2)
-                    if total - null_count > 0:
-                        combined["column_stats"][col]["unique_percentage"] = round((unique_count / (total - null_count) * 100), 2)
+            # Recalculate percentages
+            if total > 0:
+                col_stats["null_percentage"] = round((null_count / total * 100), 2)
+                unique_count = col_stats.get("unique_count", 0)
+                if total - null_count > 0:
+                    col_stats["unique_percentage"] = round((unique_count / (total - null_count) * 100), 2)
         
         return combined
 
-    def analyze_data_quality(self, data: pd.DataFrame, use_sampling: bool = True) -> Dict[str, Any]:
+    @staticmethod
+    def from_database_profile(profile: Dict[str, Any],
+                              top_values: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Build analyze_data_quality metrics from aggregates computed in the database.
+        
+        Args:
+            profile: Result of Database.profile_table; numeric columns are the
+                ones carrying mean/std/min/max
+            top_values: Most frequent values of the non-numeric columns, as
+                returned by Database.top_values, by column name
+        """
+        total_rows = profile['total_rows']
+        metrics = {
+            "total_rows": total_rows,
+            "total_columns": len(profile['columns']),
+            "schema_info": {
+                "numeric_columns": [],
+                "string_columns": [],
+                "date_columns": [],
+                "datetime_columns": [],
+                "nested_columns": [],
+                "array_columns": [],
+                "flattened_columns": []
+            },
+            "column_stats": {},
+            "data_quality_issues": [],
+            "analysis_info": {
+                "total_rows": total_rows,
+                "processed_rows": total_rows,
+                "processed_in_chunks": False,
+                "parallel_processing": False
+            }
+        }
+        
+        schema_info = metrics["schema_info"]
+        for col, stats in profile['columns'].items():
+            type_name = stats['data_type'].lower()
+            if 'mean' in stats:
+                schema_info["numeric_columns"].append(col)
+            elif 'datetime' in type_name or 'timestamp' in type_name:
+                schema_info["datetime_columns"].append(col)
+            elif 'date' in type_name:
+                schema_info["date_columns"].append(col)
+            else:
+                schema_info["string_columns"].append(col)
+            
+            null_count = stats['null_count']
+            unique_count = stats['unique_count']
+            non_null = total_rows - null_count
+            col_top_values = top_values.get(col, [])
+            col_stats = {
+                "column_name": col,
+                "data_type": stats['data_type'],
+                "total_rows": total_rows,
+                "null_count": null_count,
+                "null_percentage": round((null_count / total_rows * 100), 2) if total_rows else 0.0,
+                "unique_count": unique_count,
+                "unique_percentage": round((unique_count / non_null * 100), 2) if non_null else 0.0,
+                "sample_values": [str(entry['value']) for entry in col_top_values],
+                "value_counts": format_value_counts(col_top_values, total_rows) if total_rows else {}
+            }
+            if 'mean' in stats:
+                col_stats.update({key: stats[key] for key in ('mean', 'std', 'min', 'max')})
+            metrics["column_stats"][col] = col_stats
+        
+        detect_quality_issues(metrics)
+        return metrics
+
+    def analyze_data_quality(self, data: Union[pd.DataFrame, pl.DataFrame], use_sampling: bool = True) -> Dict[str, Any]:
         """Analyze data quality and return comprehensive metrics.
         
         Args:
-            data: pandas DataFrame to analyze
+            data: pandas or Polars DataFrame to analyze
             use_sampling: Whether to use sampling for large datasets
             validate_data: Whether to perform data validation using JSON schema
         """
@@ -178,40 +313,64 @@ class DataAnalyzer:
             # Record total rows before any processing
             total_rows = len(data)
             
-            # Flatten any nested JSON structures
-            data = flatten_json(data)
+            if isinstance(data, pl.DataFrame):
+                # Polars input is analyzed directly; flattening and dtype
+                # optimization only apply to pandas frames
+                numeric_source_cols = numeric_columns_from_dtypes(data.schema)
+                pl_data = data
+            else:
+                # Flatten any nested JSON structures
+                data = flatten_json(data)
+                
+                # Convert to Polars once; chunks are sliced from this frame.
+                # to_polars assigns the analysis dtypes itself, so no separate
+                # pandas downcasting pass is needed beforehand.
+                numeric_source_cols = numeric_columns_from_dtypes(data.dtypes.to_dict())
+                pl_data = to_polars(data)
+            
+            # Numeric summaries are computed once over the full dataset in a
+            # single fused pass, for both the chunked and single-pass paths
+            numeric_stats = compute_numeric_stats(pl_data, [
+                col for col, dtype in pl_data.schema.items()
+                if dtype.base_type() in NUMERIC_DTYPES
+            ])
             
-            # Optimize memory usage by converting to appropriate dtypes
-            data = optimize_dtypes(data)
+            # Only chunk datasets too large for a single vectorized pass
+            fits_single_pass = (
+                total_rows <= self.single_pass_rows
+                or pl_data.estimated_size() < self.single_pass_bytes
+            )
             
             # Process large datasets in chunks without sampling
             chunk_size = min(100000, max(10000, total_rows // 10))  # Dynamic chunk size
-            if total_rows > chunk_size:
+            if not fits_single_pass and total_rows > chunk_size:
                 logger.info(f"Processing {total_rows} records in chunks of {chunk_size}")
                 chunk_metrics = []
                 processed_rows = 0
                 
-                # Create chunks for parallel processing
-                chunks = []
-                for start_idx in range(0, total_rows, chunk_size):
-                    end_idx = min(start_idx + chunk_size, total_rows)
-                    chunks.append((start_idx, end_idx))
+                # Unique counts are computed once over the whole dataset with
+                # HyperLogLog, since per-chunk counts cannot be summed
+                unique_counts = pl_data.select(pl.all().approx_n_unique()).row(0, named=True)
                 
-                # Process chunks in parallel
-                with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as executor:
-                    future_to_chunk = {
-                        executor.submit(self._process_chunk, data, start_idx, end_idx): (start_idx, end_idx)
-                        for start_idx, end_idx in chunks
-                    }
-                    
-                    for future in as_completed(future_to_chunk):
-                        chunk_result = future.result()
+                # Process chunks sequentially; Polars parallelizes the per-chunk
+                # column reductions natively, so a Python thread pool would only
+                # contend on the GIL. Objects alive before the loop are frozen so
+                # automatic collections triggered by chunk allocations do not
+                # rescan the whole heap.
+                gc.freeze()
+                try:
+                    for start_idx in range(0, total_rows, chunk_size):
+                        end_idx = min(start_idx + chunk_size, total_rows)
+                        chunk_result = self._process_chunk(
+                            pl_data, start_idx, end_idx - start_idx, numeric_source_cols, unique_counts
+                        )
                         if chunk_result:
                             chunk_metrics.append(chunk_result)
-                            start_idx, end_idx = future_to_chunk[future]
                             processed_rows += end_idx - start_idx
                             
                             logger.info(f"Processed {processed_rows}/{total_rows} rows")
+                finally:
+                    gc.unfreeze()
                 
                 # Combine metrics from all chunks
                 metrics = self._combine_chunk_metrics(chunk_metrics)
@@ -221,7 +380,7 @@ class DataAnalyzer:
                     "total_rows": total_rows,
                     "processed_rows": processed_rows,
                     "processed_in_chunks": True,
-                    "parallel_processing": True
+                    "parallel_processing": False
                 }
                 
                 # Calculate data quality issues for chunked data
@@ -230,8 +389,7 @@ class DataAnalyzer:
             else:
                 # For small datasets, process everything at once
                 try:
-                    pl_data = to_polars(data)
-                    metrics = self._analyze_chunk(pl_data, data.dtypes.to_dict())
+                    metrics = self._analyze_chunk(pl_data, numeric_source_cols)
                     
                     metrics["analysis_info"] = {
                         "total_rows": total_rows,
@@ -254,6 +412,10 @@ class DataAnalyzer:
                         }
                     }
             
+            for col, col_numeric_stats in numeric_stats.items():
+                if col in metrics.get("column_stats", {}):
+                    metrics["column_stats"][col].update(col_numeric_stats)
+            
             return metrics
             
         except Exception as e:
@@ -9,8 +9,59 @@ This module provides comprehensive data analysis capabilities including:
 """
 
 import pandas as pd
+import polars as pl
 import numpy as np
-from typing import Dict, List, Any
+import warnings
+from typing import Dict, List, Any, Optional
+
+def _to_float(value: Optional[float]) -> float:
+    """Convert a Polars aggregate to float, mapping null to NaN like pandas."""
+    return float("nan") if value is None else float(value)
+
+# float32 represents every integer below this magnitude exactly
+_FLOAT32_EXACT_LIMIT = 2 ** 24
+
+# Smallest std/|mean| ratio for which float32 keeps centred values accurate;
+# below it subtracting the mean cancels most of float32's ~7 digits
+_FLOAT32_MIN_RELATIVE_SPREAD = 1e-3
+
+def _numeric_array(data: pd.DataFrame, downcast: bool = False) -> np.ndarray:
+    """Copy numeric columns into one 2-D array with NaN for missing values.
+    
+    With downcast, float32 is used to halve memory traffic unless some
+    magnitude reaches 2**24, where float32 starts dropping precision, or some
+    column's spread is tiny next to its mean, where centring it would.
+    """
+    if downcast:
+        values = data.to_numpy(dtype=np.float32, na_value=np.nan, copy=True)
+        if np.fmax.reduce(np.abs(values), axis=None, initial=0.0) < _FLOAT32_EXACT_LIMIT:
+            with np.errstate(invalid='ignore'), warnings.catch_warnings():
+                # All-NaN columns have no mean or spread to compare
+                warnings.simplefilter('ignore', RuntimeWarning)
+                mean = np.nanmean(values, axis=0, dtype=np.float64)
+                std = np.nanstd(values, axis=0, dtype=np.float64)
+            if not (std < _FLOAT32_MIN_RELATIVE_SPREAD * np.abs(mean)).any():
+                return values
+    return data.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+
+def _fast_corr(data: pd.DataFrame, downcast: bool = False) -> pd.DataFrame:
+    """Pearson correlation matrix computed as a single BLAS matrix product.
+    
+    Falls back to pandas when values are missing, since pandas drops nulls
+    pairwise rather than per row.
+    """
+    values = _numeric_array(data, downcast)
+    if np.isnan(values).any():
+        return data.corr()
+    
+    values = values - values.mean(axis=0)
+    std = values.std(axis=0, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values /= std
+        corr = (values.T @ values) / (values.shape[0] - 1)
+    np.clip(corr, -1.0, 1.0, out=corr)
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+    return pd.DataFrame(corr, index=data.columns, columns=data.columns)
 
 class DataAnalyzer:
     """Handles data analysis tasks including quality metrics and anomaly detection.
@@ -41,35 +92,69 @@ class DataAnalyzer:
         Returns:
             Dict[str, Any]: Comprehensive quality metrics and statistics.
         """
+        numerical_cols = data.select_dtypes(include=[np.number]).columns
+        numeric_set = set(numerical_cols)
+        
+        # Non-numeric columns hold Python objects that Polars would have to
+        # convert one by one, so pandas counts them directly
+        other_data = data[[col for col in data.columns if col not in numeric_set]]
+        null_counts = other_data.isnull().sum().to_dict()
+        unique_counts = {col: int(count) for col, count in other_data.nunique().items()}
+        
+        if not numerical_cols.empty:
+            numeric_data = data[numerical_cols]
+            
+            # All statistics for all numeric columns in one multi-threaded Polars pass;
+            # Polars names columns by str(label), and results are mapped back to
+            # the original labels below
+            stats_row = pl.from_pandas(numeric_data, rechunk=False).lazy().select([
+                pl.struct([
+                    pl.col(str(col)).null_count().alias("null_count"),
+                    pl.col(str(col)).drop_nulls().n_unique().alias("unique_count"),
+                    pl.col(str(col)).mean().alias("mean"),
+                    pl.col(str(col)).std().alias("std"),
+                    pl.col(str(col)).min().cast(pl.Float64).alias("min"),
+                    pl.col(str(col)).max().cast(pl.Float64).alias("max"),
+                    pl.col(str(col)).quantile(0.25, interpolation="linear").alias("25"),
+                    pl.col(str(col)).quantile(0.50, interpolation="linear").alias("50"),
+                    pl.col(str(col)).quantile(0.75, interpolation="linear").alias("75")
+                ]).alias(str(col))
+                for col in numerical_cols
+            ]).collect().row(0, named=True)
+            
+            for col in numerical_cols:
+                null_counts[col] = stats_row[str(col)]["null_count"]
+                unique_counts[col] = stats_row[str(col)]["unique_count"]
+        
         metrics = {
             "total_rows": len(data),
             "total_columns": len(data.columns),
-            "missing_values_per_column": data.isnull().sum().to_dict(),
+            "missing_values_per_column": {col: null_counts[col] for col in data.columns},
             "data_types": {col: str(dtype) for col, dtype in data.dtypes.items()},
-            "unique_values_per_column": {col: int(data[col].nunique()) for col in data.columns},
-            "sample_values": {col: data[col].head().tolist() for col in data.columns}
+            "unique_values_per_column": {col: unique_counts[col] for col in data.columns},
+            "sample_values": data.head().to_dict(orient="list")
         }
         
         # Add basic statistics for numerical columns
-        numerical_cols = data.select_dtypes(include=[np.number]).columns
         if not numerical_cols.empty:
-            metrics["numerical_statistics"] = {
-                col: {
-                    "mean": float(data[col].mean()),
-                    "std": float(data[col].std()),
-                    "min": float(data[col].min()),
-                    "max": float(data[col].max()),
+            metrics["numerical_statistics"] = {}
+            for col in numerical_cols:
+                col_stats = stats_row[str(col)]
+                metrics["numerical_statistics"][col] = {
+                    "mean": _to_float(col_stats["mean"]),
+                    "std": _to_float(col_stats["std"]),
+                    "min": _to_float(col_stats["min"]),
+                    "max": _to_float(col_stats["max"]),
                     "quartiles": {
-                        "25": float(data[col].quantile(0.25)),
-                        "50": float(data[col].quantile(0.50)),
-                        "75": float(data[col].quantile(0.75))
+                        "25": _to_float(col_stats["25"]),
+                        "50": _to_float(col_stats["50"]),
+                        "75": _to_float(col_stats["75"])
                     }
-                } for col in numerical_cols
-            }
+                }
             
             # Add correlation matrix for numerical columns
             if len(numerical_cols) > 1:
-                metrics["correlations"] = data[numerical_cols].corr().to_dict()
+                metrics["correlations"] = _fast_corr(numeric_data).to_dict()
         
         return metrics
     
@@ -89,18 +174,27 @@ class DataAnalyzer:
             pd.DataFrame: Original data with additional columns for anomaly
                         indicators and scores.
         """
-        for col in columns:
-            if pd.api.types.is_numeric_dtype(data[col]):
-                mean = data[col].mean()
-                std = data[col].std()
-                # Mark values beyond 3 standard deviations as anomalies
-                data[f"{col}_is_anomaly"] = abs(data[col] - mean) > 3 * std
-                # Calculate anomaly score (0 to 1, higher means more anomalous)
-                data[f"{col}_anomaly_score"] = abs(data[col] - mean) / (3 * std)
-                
-                # Add additional anomaly statistics
-                data[f"{col}_zscore"] = (data[col] - mean) / std
-                data[f"{col}_is_extreme"] = abs(data[f"{col}_zscore"]) > 5  # More extreme anomalies
+        numeric_cols = [col for col in columns if pd.api.types.is_numeric_dtype(data[col])]
+        if not numeric_cols:
+            return data
+        
+        # Score all columns at once, standardizing a private copy in place;
+        # scores stay float64 since they are returned to the caller
+        zscores = _numeric_array(data[numeric_cols])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zscores -= np.nanmean(zscores, axis=0)
+            zscores /= np.nanstd(zscores, axis=0, ddof=1)
+        abs_zscores = np.abs(zscores)
+        
+        for i, col in enumerate(numeric_cols):
+            # Mark values beyond 3 standard deviations as anomalies
+            data[f"{col}_is_anomaly"] = abs_zscores[:, i] > 3
+            # Calculate anomaly score (0 to 1, higher means more anomalous)
+            data[f"{col}_anomaly_score"] = abs_zscores[:, i] / 3
+            
+            # Add additional anomaly statistics
+            data[f"{col}_zscore"] = zscores[:, i]
+            data[f"{col}_is_extreme"] = abs_zscores[:, i] > 5  # More extreme anomalies
         
         return data
     
@@ -127,18 +221,17 @@ class DataAnalyzer:
         if not numerical_cols.empty:
             # Find highly correlated columns
             if len(numerical_cols) > 1:
-                corr_matrix = data[numerical_cols].corr()
-                high_correlations = []
-                for i in range(len(numerical_cols)):
-                    for j in range(i + 1, len(numerical_cols)):
-                        correlation = corr_matrix.iloc[i, j]
-                        if abs(correlation) > 0.7:  # Strong correlation threshold
-                            high_correlations.append({
-                                "column1": numerical_cols[i],
-                                "column2": numerical_cols[j],
-                                "correlation": float(correlation)
-                            })
-                insights["high_correlations"] = high_correlations
+                corr_matrix = _fast_corr(data[numerical_cols], downcast=True).to_numpy()
+                # Strong correlation threshold, upper triangle only
+                rows, cols = np.nonzero(np.triu(np.abs(corr_matrix) > 0.7, k=1))
+                insights["high_correlations"] = [
+                    {
+                        "column1": numerical_cols[i],
+                        "column2": numerical_cols[j],
+                        "correlation": float(corr_matrix[i, j])
+                    }
+                    for i, j in zip(rows, cols)
+                ]
             
             # Identify columns with high variance
             variances = data[numerical_cols].var()
@@ -146,15 +239,16 @@ class DataAnalyzer:
             insights["high_variance_columns"] = high_variance_cols
         
         # Analyze categorical columns
-        categorical_cols = data.select_dtypes(include=['object']).columns
+        categorical_cols = data.select_dtypes(include=['object', 'string']).columns
         if not categorical_cols.empty:
             category_stats = {}
             for col in categorical_cols:
                 value_counts = data[col].value_counts()
+                probs = value_counts.to_numpy(dtype=np.float64) / len(data)
                 category_stats[col] = {
-                    "unique_values": len(value_counts),
+                    "unique_values": value_counts.size,
                     "most_common": value_counts.head(3).to_dict(),
-                    "distribution_entropy": float(-(value_counts / len(data) * np.log2(value_counts / len(data))).sum())
+                    "distribution_entropy": float(-np.sum(probs * np.log2(probs)))
                 }
             insights["categorical_statistics"] = category_stats
         
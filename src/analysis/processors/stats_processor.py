@@ -3,44 +3,102 @@
 import pandas as pd
 import polars as pl
 import re
-from typing import Dict, Any
+from typing import Dict, List, Any, Optional
 from logging import getLogger
 
 logger = getLogger(__name__)
 
-def compute_stats(series: pl.Series) -> Dict[str, Any]:
-    """Compute statistics for a single column."""
+# Sample classification patterns used by detect_quality_issues
+_NUMERIC_PATTERN = re.compile(r'^-?\d*\.?\d+$')
+_SPECIAL_CHAR_PATTERN = re.compile(r'[^a-zA-Z0-9\s]')
+
+def top_values_expr(column: str, dtype: pl.PolarsDataType, limit: Optional[int] = None) -> pl.Expr:
+    """Build an expression yielding a column's non-null values by frequency.
+    
+    The result is a single-row list of (value, count) structs so expressions for
+    many columns can be collected together in one select.
+    
+    Args:
+        column: Column to count values of
+        dtype: Polars dtype of the column
+        limit: Number of most frequent values to keep (default: all values)
+    """
+    expr = pl.col(column).drop_nulls()
+    if dtype == pl.Date:
+        expr = expr.dt.strftime("%Y-%m-%d")
+    elif dtype == pl.Datetime:
+        expr = expr.dt.strftime("%Y-%m-%d %H:%M:%S")
+    counts = expr.value_counts(sort=True)
+    if limit is not None:
+        counts = counts.head(limit)
+    return counts.implode().alias(column)
+
+def format_value_counts(top_values: List[Dict[str, Any]], total_rows: int) -> Dict[str, Dict[str, Any]]:
+    """Format (value, count) entries as value_counts keyed by the value as text.
+    
+    Args:
+        top_values: Entries in frequency order, each holding a value and its count
+        total_rows: Row count the percentages are relative to
+    """
+    value_counts = {}
+    for entry in top_values:
+        value, count = entry.values()
+        value_counts[str(value)] = {
+            "count": int(count),
+            "percentage": round((int(count) / total_rows * 100), 2)
+        }
+    return value_counts
+
+def compute_numeric_stats(pl_data: pl.DataFrame, columns: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Compute mean, std, min and max for numeric columns in one pass.
+    
+    All statistics are fused into a single select so Polars reduces every
+    column buffer with its vectorized kernels, in parallel across columns.
+    """
+    if not columns:
+        return {}
+    return pl_data.select([
+        pl.struct([
+            pl.col(col).mean().alias("mean"),
+            pl.col(col).std().alias("std"),
+            pl.col(col).min().cast(pl.Float64).alias("min"),
+            pl.col(col).max().cast(pl.Float64).alias("max")
+        ]).alias(col)
+        for col in columns
+    ]).row(0, named=True)
+
+def compute_stats(series: pl.Series, null_count: Optional[int] = None,
+                  unique_count: Optional[int] = None,
+                  top_values: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Compute statistics for a single column.
+    
+    Args:
+        series: Column to analyze
+        null_count: Precomputed null count (computed from the series if omitted)
+        unique_count: Precomputed unique count (computed from the series if omitted)
+        top_values: Precomputed result of top_values_expr for this column
+    """
     try:
-        # Get sample values first
-        sample_values = series.drop_nulls().unique().head(10).to_list()
+        if null_count is None:
+            null_count = series.null_count()
+        if unique_count is None:
+            unique_count = series.n_unique()
         
-        # Format sample values
-        formatted_samples = [
-            value.strftime("%Y-%m-%d") if str(series.dtype).lower() in ['date', 'datetime'] and value is not None
-            else str(value) if value is not None else 'null'
-            for value in sample_values
-        ]
+        # Get sample values first, formatting dates with the vectorized kernel
+        sample_values = series.drop_nulls().unique().head(10)
+        if series.dtype == pl.Date:
+            sample_values = sample_values.dt.strftime("%Y-%m-%d")
+        formatted_samples = [str(value) for value in sample_values.to_list()]
 
-        # Get value counts
+        # Get value counts, most frequent first
         value_counts = {}
         try:
-            if str(series.dtype).lower() in ['date', 'datetime']:
-                # Format dates to strings first
-                formatted_series = series.map_elements(
-                    lambda x: x.strftime("%Y-%m-%d") if x is not None else None,
-                    return_dtype=pl.String
-                )
-                pd_series = formatted_series.to_pandas()
-            else:
-                pd_series = series.to_pandas()
+            if top_values is None:
+                top_values = series.to_frame().select(
+                    top_values_expr(series.name, series.dtype)
+                ).row(0)[0]
             
-            counts = pd_series.value_counts()
-            for value, count in zip(counts.index, counts.values):
-                value_str = str(value) if value is not None else 'null'
-                value_counts[value_str] = {
-                    "count": int(count),
-                    "percentage": round((int(count) / len(series) * 100), 2)
-                }
+            value_counts = format_value_counts(top_values, len(series))
         except Exception as e:
             logger.warning(f"Error computing value counts: {e}")
 
@@ -48,10 +106,10 @@ def compute_stats(series: pl.Series) -> Dict[str, Any]:
             "column_name": series.name,
             "data_type": str(series.dtype),
             "total_rows": len(series),
-            "null_count": series.null_count(),
-            "null_percentage": round((series.null_count() / len(series) * 100), 2),
-            "unique_count": series.n_unique(),
-            "unique_percentage": round((series.n_unique() / (len(series) - series.null_count()) * 100), 2),
+            "null_count": null_count,
+            "null_percentage": round((null_count / len(series) * 100), 2),
+            "unique_count": unique_count,
+            "unique_percentage": round((unique_count / (len(series) - null_count) * 100), 2),
             "sample_values": formatted_samples,
             "value_counts": value_counts
         }
@@ -117,15 +175,18 @@ def detect_quality_issues(metrics: Dict[str, Any]) -> None:
         
         # Check for inconsistent data types in string columns
         if col in schema_info.get("string_columns", []):
-            # Check for mixed numeric and non-numeric values
-            numeric_pattern = re.compile(r'^-?\d*\.?\d+$')
-            mixed_types = False
+            # Classify every sample in a single pass
             numeric_count = 0
-            
-            for sample in str_samples:
-                if numeric_pattern.match(str(sample)):
+            has_upper = has_lower = False
+            for s in str_samples:
+                if _NUMERIC_PATTERN.match(s):
                     numeric_count += 1
-                
+                elif s.isupper():
+                    has_upper = True
+                elif s.islower():
+                    has_lower = True
+            
+            # Check for mixed numeric and non-numeric values
             if len(str_samples) > 0 and 0 < numeric_count < len(str_samples):  # Some but not all are numeric
                 issue_key = f"mixed_types_{col}"
                 if issue_key not in processed_issues:
@@ -138,7 +199,7 @@ def detect_quality_issues(metrics: Dict[str, Any]) -> None:
                     processed_issues.add(issue_key)
             
             # Check for inconsistent casing
-            if any(s.isupper() for s in str_samples) and any(s.islower() for s in str_samples):
+            if has_upper and has_lower:
                 issue_key = f"inconsistent_case_{col}"
                 if issue_key not in processed_issues:
                     metrics["data_quality_issues"].append({
@@ -149,9 +210,8 @@ def detect_quality_issues(metrics: Dict[str, Any]) -> None:
                     })
                     processed_issues.add(issue_key)
             
-            # Check for special characters
-            special_char_pattern = re.compile(r'[^a-zA-Z0-9\s]')
-            if any(special_char_pattern.search(s) for s in str_samples):
+            # Check for special characters with one scan over all samples
+            if _SPECIAL_CHAR_PATTERN.search("".join(str_samples)):
                 issue_key = f"special_chars_{col}"
                 if issue_key not in processed_issues:
                     metrics["data_quality_issues"].append({
@@ -1,19 +1,64 @@
 """Data profiling module for generating detailed reports."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import json
+import orjson
 from logging import getLogger
+from typing import Any, Dict, List
 
 logger = getLogger(__name__)
 
-def generate_profile_report(df: pd.DataFrame, output_dir: str, title: str = "Data Profile Report") -> str:
+# Translation table escaping user-supplied text for HTML
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+# Descriptive statistics reported for numeric columns, as named by describe()
+_NUMERIC_STAT_KEYS = ('mean', 'std', 'min', 'max', '25%', '50%', '75%')
+
+def _escape(value) -> str:
+    """Escape a value for inclusion in the HTML report."""
+    return str(value).translate(_HTML_ESCAPE_TABLE)
+
+# JSON escapes keeping embedded data from closing the <script> element or
+# breaking older JavaScript parsers
+_SCRIPT_JSON_ESCAPE_TABLE = str.maketrans({
+    '<': '\\u003c', '>': '\\u003e', '&': '\\u0026',
+    '\u2028': '\\u2028', '\u2029': '\\u2029'
+})
+
+def _script_json(value: Any) -> str:
+    """Serialize a value as JSON that is safe to embed in a <script> element."""
+    return orjson.dumps(
+        value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode().translate(_SCRIPT_JSON_ESCAPE_TABLE)
+
+_REPORT_STYLE = """<style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                .summary { background: #f5f5f5; padding: 20px; border-radius: 5px; margin-bottom: 20px; }
+                .column { background: white; padding: 20px; border: 1px solid #ddd; margin-bottom: 10px; border-radius: 5px; }
+                table { width: 100%; border-collapse: collapse; margin-top: 10px; }
+                th, td { text-align: left; padding: 8px; border-bottom: 1px solid #ddd; }
+                th { background-color: #f5f5f5; }
+                .chart { margin-top: 10px; }
+            </style>"""
+
+def _top_values(series: pd.Series, row_count: int) -> List[Dict[str, Any]]:
+    """Return the ten most frequent values of a column with their shares."""
+    value_counts = series.value_counts().head(10).to_dict()
+    return [
+        {'value': str(k), 'count': int(v), 'percentage': round(v/row_count*100, 2)}
+        for k, v in value_counts.items()
+    ]
+
+def generate_profile_report(df: pd.DataFrame, output_dir: str, title: str = "Data Profile Report",
+                            filename: str = "profile_report.html") -> str:
     """Generate a detailed profile report for the DataFrame.
     
     Args:
         df: The pandas DataFrame to analyze
         output_dir: Directory to save the report
         title: Title for the report
+        filename: Name of the report file within output_dir
         
     Returns:
         str: Path to the generated HTML report
@@ -23,124 +68,149 @@ def generate_profile_report(df: pd.DataFrame, output_dir: str, title: str = "Dat
         os.makedirs(output_dir, exist_ok=True)
         
         # Generate report filename
-        report_path = os.path.join(output_dir, "profile_report.html")
+        report_path = os.path.join(output_dir, filename)
         
-        # Generate profile data
+        # Generate profile data from frame-wide aggregates computed once
         logger.info("Generating profile report...")
+        row_count = len(df)
+        missing_counts = df.isna().sum()
+        missing_cells = int(missing_counts.sum())
+        duplicate_rows = int(df.duplicated().sum())
+        unique_counts = df.nunique()
+        numeric_data = df.select_dtypes(include="number")
+        if len(numeric_data.columns):
+            numeric_summary = numeric_data.describe(percentiles=[.25, .5, .75]).T
+        else:
+            numeric_summary = pd.DataFrame(columns=list(_NUMERIC_STAT_KEYS))
+        
         profile_data = {
             'title': title,
             'summary': {
-                'rows': len(df),
+                'rows': row_count,
                 'columns': len(df.columns),
-                'missing_cells': df.isna().sum().sum(),
-                'missing_cells_pct': round(df.isna().sum().sum() / (len(df) * len(df.columns)) * 100, 2),
-                'duplicate_rows': len(df) - len(df.drop_duplicates()),
-                'duplicate_rows_pct': round((len(df) - len(df.drop_duplicates())) / len(df) * 100, 2)
+                'missing_cells': missing_cells,
+                'missing_cells_pct': round(missing_cells / (row_count * len(df.columns)) * 100, 2),
+                'duplicate_rows': duplicate_rows,
+                'duplicate_rows_pct': round(duplicate_rows / row_count * 100, 2)
             },
             'columns': {}
         }
         
-        # Analyze each column
-        for col in df.columns:
+        # Statistics are gathered as parallel lists, one entry per column, from
+        # the frame-wide aggregates above
+        names = list(df.columns)
+        numeric_stats = numeric_summary.reindex(names)[list(_NUMERIC_STAT_KEYS)]
+        numeric_stats = numeric_stats.astype(object).where(numeric_stats.notna(), None)
+        stats = {key: numeric_stats[key].tolist() for key in _NUMERIC_STAT_KEYS}
+        types = [str(dtype) for dtype in df.dtypes]
+        missing = missing_counts.tolist()
+        missing_pct = (missing_counts / row_count * 100).round(2).tolist()
+        unique = unique_counts.tolist()
+        unique_pct = (unique_counts / row_count * 100).round(2).tolist()
+        
+        # Add value counts (top 10), hashing columns concurrently since the
+        # value_counts kernels release the GIL
+        with ThreadPoolExecutor() as executor:
+            top_values = list(executor.map(
+                lambda i: _top_values(df.iloc[:, i], row_count), range(len(names))
+            ))
+        
+        # The profile itself keeps one dict per column
+        for i, col in enumerate(names):
             col_data = {
                 'name': col,
-                'type': str(df[col].dtype),
-                'count': len(df[col]),
-                'missing': int(df[col].isna().sum()),
-                'missing_pct': round(df[col].isna().sum() / len(df[col]) * 100, 2),
-                'unique': int(df[col].nunique()),
-                'unique_pct': round(df[col].nunique() / len(df[col]) * 100, 2)
+                'type': types[i],
+                'count': row_count,
+                'missing': missing[i],
+                'missing_pct': missing_pct[i],
+                'unique': unique[i],
+                'unique_pct': unique_pct[i]
             }
-            
-            # Add descriptive statistics for numeric columns
-            if pd.api.types.is_numeric_dtype(df[col]):
+            if col in numeric_summary.index:
                 col_data.update({
-                    'mean': float(df[col].mean()) if not df[col].empty else None,
-                    'std': float(df[col].std()) if not df[col].empty else None,
-                    'min': float(df[col].min()) if not df[col].empty else None,
-                    'max': float(df[col].max()) if not df[col].empty else None,
+                    'mean': stats['mean'][i],
+                    'std': stats['std'][i],
+                    'min': stats['min'][i],
+                    'max': stats['max'][i],
                     'quartiles': {
-                        '25%': float(df[col].quantile(0.25)) if not df[col].empty else None,
-                        '50%': float(df[col].quantile(0.50)) if not df[col].empty else None,
-                        '75%': float(df[col].quantile(0.75)) if not df[col].empty else None
+                        '25%': stats['25%'][i],
+                        '50%': stats['50%'][i],
+                        '75%': stats['75%'][i]
                     }
                 })
-            
-            # Add value counts (top 10)
-            value_counts = df[col].value_counts().head(10).to_dict()
-            col_data['top_values'] = [
-                {'value': str(k), 'count': int(v), 'percentage': round(v/len(df[col])*100, 2)}
-                for k, v in value_counts.items()
-            ]
-            
+            col_data['top_values'] = top_values[i]
             profile_data['columns'][col] = col_data
         
-        # Generate HTML report
-        html_content = f"""
+        # Stream the HTML report to disk fragment by fragment
+        summary = profile_data['summary']
+        title_html = _escape(title)
+        with open(report_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(f"""
         <!DOCTYPE html>
         <html>
         <head>
-            <title>{title}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .summary {{ background: #f5f5f5; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-                .column {{ background: white; padding: 20px; border: 1px solid #ddd; margin-bottom: 10px; border-radius: 5px; }}
-                table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
-                th, td {{ text-align: left; padding: 8px; border-bottom: 1px solid #ddd; }}
-                th {{ background-color: #f5f5f5; }}
-                .chart {{ margin-top: 10px; }}
-            </style>
+            <title>{title_html}</title>
+            {_REPORT_STYLE}
         </head>
         <body>
-            <h1>{title}</h1>
+            <h1>{title_html}</h1>
             
             <div class="summary">
                 <h2>Dataset Summary</h2>
                 <table>
-                    <tr><th>Number of Rows</th><td>{profile_data['summary']['rows']}</td></tr>
-                    <tr><th>Number of Columns</th><td>{profile_data['summary']['columns']}</td></tr>
-                    <tr><th>Missing Cells</th><td>{profile_data['summary']['missing_cells']} ({profile_data['summary']['missing_cells_pct']}%)</td></tr>
-                    <tr><th>Duplicate Rows</th><td>{profile_data['summary']['duplicate_rows']} ({profile_data['summary']['duplicate_rows_pct']}%)</td></tr>
+                    <tr><th>Number of Rows</th><td>{summary['rows']}</td></tr>
+                    <tr><th>Number of Columns</th><td>{summary['columns']}</td></tr>
+                    <tr><th>Missing Cells</th><td>{summary['missing_cells']} ({summary['missing_cells_pct']}%)</td></tr>
+                    <tr><th>Duplicate Rows</th><td>{summary['duplicate_rows']} ({summary['duplicate_rows_pct']}%)</td></tr>
                 </table>
             </div>
             
             <h2>Column Analysis</h2>
-            {''.join([f'''
+""")
+            for col_info in profile_data['columns'].values():
+                f.write(f"""
             <div class="column">
-                <h3>{col_info['name']} ({col_info['type']})</h3>
+                <h3>{_escape(col_info['name'])} ({_escape(col_info['type'])})</h3>
                 <table>
                     <tr><th>Count</th><td>{col_info['count']}</td></tr>
                     <tr><th>Missing</th><td>{col_info['missing']} ({col_info['missing_pct']}%)</td></tr>
                     <tr><th>Unique</th><td>{col_info['unique']} ({col_info['unique_pct']}%)</td></tr>
-                    {f'''
-                    <tr><th>Mean</th><td>{col_info.get('mean', 'N/A')}</td></tr>
-                    <tr><th>Std</th><td>{col_info.get('std', 'N/A')}</td></tr>
-                    <tr><th>Min</th><td>{col_info.get('min', 'N/A')}</td></tr>
-                    <tr><th>Max</th><td>{col_info.get('max', 'N/A')}</td></tr>
-                    <tr><th>25%</th><td>{col_info.get('quartiles', {}).get('25%', 'N/A')}</td></tr>
-                    <tr><th>50%</th><td>{col_info.get('quartiles', {}).get('50%', 'N/A')}</td></tr>
-                    <tr><th>75%</th><td>{col_info.get('quartiles', {}).get('75%', 'N/A')}</td></tr>
-                    ''' if 'mean' in col_info else ''}
+""")
+                if 'mean' in col_info:
+                    quartiles = col_info['quartiles']
+                    f.write(f"""
+                    <tr><th>Mean</th><td>{col_info['mean']}</td></tr>
+                    <tr><th>Std</th><td>{col_info['std']}</td></tr>
+                    <tr><th>Min</th><td>{col_info['min']}</td></tr>
+                    <tr><th>Max</th><td>{col_info['max']}</td></tr>
+                    <tr><th>25%</th><td>{quartiles['25%']}</td></tr>
+                    <tr><th>50%</th><td>{quartiles['50%']}</td></tr>
+                    <tr><th>75%</th><td>{quartiles['75%']}</td></tr>
+""")
+                f.write("""
                 </table>
                 
                 <h4>Top Values</h4>
                 <table>
                     <tr><th>Value</th><th>Count</th><th>Percentage</th></tr>
-                    {''.join([f"<tr><td>{v['value']}</td><td>{v['count']}</td><td>{v['percentage']}%</td></tr>" for v in col_info['top_values']])}
+""")
+                for v in col_info['top_values']:
+                    f.write(f"<tr><td>{_escape(v['value'])}</td><td>{v['count']}</td><td>{v['percentage']}%</td></tr>")
+                f.write("""
                 </table>
             </div>
-            ''' for col, col_info in profile_data['columns'].items()])}
+""")
             
+            # Serialize the profile data with orjson, escaped for the script element
+            f.write("""
             <script>
-                console.log('Profile data:', {json.dumps(profile_data)});
+                console.log('Profile data:', """)
+            f.write(_script_json(profile_data))
+            f.write(""");
             </script>
         </body>
         </html>
-        """
-        
-        # Save the report
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        """)
             
         logger.info(f"Profile report saved to: {report_path}")
         
@@ -3,17 +3,90 @@
 import pandas as pd
 from datetime import datetime
 from logging import getLogger
-from typing import Dict, Any, Optional
-import json
+from typing import Dict, Any, List, Optional
+import orjson
+import zstandard
+from sqlalchemy import (MetaData, Table, Column, Index, Integer, String, Date, DateTime,
+                        LargeBinary, func, insert, select)
 
 from ...database import Database
 
 logger = getLogger(__name__)
 
+# orjson serializes NumPy scalars/arrays and non-string keys natively
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# JSON payloads are stored as zstd-compressed BLOBs
+_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+_DECOMPRESSOR = zstandard.ZstdDecompressor()
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a value to compressed JSON for a BLOB column."""
+    return _COMPRESSOR.compress(orjson.dumps(value, option=_JSON_OPTIONS))
+
+def _loads(value: Any) -> Any:
+    """Deserialize a stored JSON column.
+    
+    Rows written before compression was introduced hold plain JSON text.
+    """
+    if isinstance(value, str):
+        return orjson.loads(value)
+    return orjson.loads(_DECOMPRESSOR.decompress(value))
+
+# Tables are declared with SQLAlchemy so their DDL (auto-increment keys,
+# binary columns, descending indexes) is generated for each database dialect
+_METADATA = MetaData()
+
+PROFILES_TABLE = Table(
+    'data_profiles', _METADATA,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('dataset_name', String(255)),
+    Column('timestamp', DateTime),
+    Column('summary', LargeBinary),
+    Column('column_profiles', LargeBinary),
+    Column('created_at', DateTime, server_default=func.current_timestamp())
+)
+Index('idx_profiles_dataset_ts', PROFILES_TABLE.c.dataset_name, PROFILES_TABLE.c.timestamp.desc())
+
+ANOMALIES_TABLE = Table(
+    'data_anomalies', _METADATA,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('dataset_name', String(255)),
+    Column('comparison_date', Date),
+    Column('summary', LargeBinary),
+    Column('column_anomalies', LargeBinary),
+    Column('new_values', LargeBinary),
+    Column('missing_values', LargeBinary),
+    Column('created_at', DateTime, server_default=func.current_timestamp())
+)
+Index('idx_anomalies_dataset_date', ANOMALIES_TABLE.c.dataset_name,
+      ANOMALIES_TABLE.c.comparison_date.desc())
+
 class AnalysisStorage:
     def __init__(self, db: Database):
         """Initialize the analysis storage with database connection."""
         self.db = db
+        # Tables are created at most once per storage instance
+        self._profiles_ready = False
+        self._anomalies_ready = False
+    
+    def _ensure_profiles_table(self) -> None:
+        """Create the profiles table on first use."""
+        if not self._profiles_ready:
+            self.db.create_tables(PROFILES_TABLE)
+            self._profiles_ready = True
+    
+    def _profile_params(self, profile_data: Dict[str, Any], dataset_name: str,
+                        timestamp: Optional[datetime]) -> Dict[str, Any]:
+        """Build the insert parameters for one profile record."""
+        if timestamp is None:
+            timestamp = datetime.now()
+        return {
+            'dataset_name': dataset_name,
+            'timestamp': timestamp,
+            'summary': _dumps(profile_data.get('summary', {})),
+            'column_profiles': _dumps(profile_data.get('columns', {}))
+        }
     
     def store_profile_results(self, 
                             profile_data: Dict[str, Any],
@@ -30,38 +103,29 @@ class AnalysisStorage:
         Returns:
             ID of the stored profile record
         """
-        if timestamp is None:
-            timestamp = datetime.now()
-            
-        # Create profiles table if it doesn't exist
-        self.db.execute("""
-            CREATE TABLE IF NOT EXISTS data_profiles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                dataset_name VARCHAR(255),
-                timestamp DATETIME,
-                summary JSON,
-                column_profiles JSON,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        self._ensure_profiles_table()
         
         # Insert profile data
-        query = """
-            INSERT INTO data_profiles (dataset_name, timestamp, summary, column_profiles)
-            VALUES (?, ?, ?, ?)
+        params = self._profile_params(profile_data, dataset_name, timestamp)
+        return self.db.execute(insert(PROFILES_TABLE), params)
+    
+    def store_many_profiles(self, records: List[Dict[str, Any]]) -> None:
         """
+        Store several data profiling results with a single batched insert.
         
-        summary = profile_data.get('summary', {})
-        columns = profile_data.get('columns', {})
-        
-        params = (
-            dataset_name,
-            timestamp,
-            json.dumps(summary),
-            json.dumps(columns)
-        )
+        Args:
+            records: Dictionaries with 'profile_data', 'dataset_name' and an
+                optional 'timestamp', matching store_profile_results
+        """
+        if not records:
+            return
+        self._ensure_profiles_table()
         
-        return self.db.execute(query, params)
+        self.db.executemany(insert(PROFILES_TABLE), [
+            self._profile_params(record['profile_data'], record['dataset_name'],
+                                 record.get('timestamp'))
+            for record in records
+        ])
     
     def store_anomaly_results(self,
                             anomaly_data: Dict[str, Any],
@@ -78,84 +142,68 @@ class AnalysisStorage:
         Returns:
             ID of the stored anomaly record
         """
-        # Create anomalies table if it doesn't exist
-        self.db.execute("""
-            CREATE TABLE IF NOT EXISTS data_anomalies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                dataset_name VARCHAR(255),
-                comparison_date DATE,
-                summary JSON,
-                column_anomalies JSON,
-                new_values JSON,
-                missing_values JSON,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        # Create anomalies table on first use
+        if not self._anomalies_ready:
+            self.db.create_tables(ANOMALIES_TABLE)
+            self._anomalies_ready = True
         
         # Insert anomaly data
-        query = """
-            INSERT INTO data_anomalies (
-                dataset_name, 
-                comparison_date,
-                summary,
-                column_anomalies,
-                new_values,
-                missing_values
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-        """
+        params = {
+            'dataset_name': dataset_name,
+            'comparison_date': comparison_date,
+            'summary': _dumps(anomaly_data.get('summary', {})),
+            'column_anomalies': _dumps(anomaly_data.get('column_anomalies', {})),
+            'new_values': _dumps(anomaly_data.get('new_values', {})),
+            'missing_values': _dumps(anomaly_data.get('missing_values', {}))
+        }
         
-        params = (
-            dataset_name,
-            comparison_date,
-            json.dumps(anomaly_data.get('summary', {})),
-            json.dumps(anomaly_data.get('column_anomalies', {})),
-            json.dumps(anomaly_data.get('new_values', {})),
-            json.dumps(anomaly_data.get('missing_values', {}))
-        )
-        
-        return self.db.execute(query, params)
+        return self.db.execute(insert(ANOMALIES_TABLE), params)
     
     def get_latest_profile(self, dataset_name: str) -> Dict[str, Any]:
         """Retrieve the latest profile for a dataset."""
-        query = """
-            SELECT * FROM data_profiles
-            WHERE dataset_name = ?
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """
+        profiles = PROFILES_TABLE.c
+        query = (
+            select(profiles.id, profiles.dataset_name, profiles.timestamp,
+                   profiles.summary, profiles.column_profiles, profiles.created_at)
+            .where(profiles.dataset_name == dataset_name)
+            .order_by(profiles.timestamp.desc())
+            .limit(1)
+        )
         
-        result = self.db.fetch_one(query, (dataset_name,))
+        result = self.db.fetch_one(query)
         if result:
             return {
                 'id': result[0],
                 'dataset_name': result[1],
                 'timestamp': result[2],
-                'summary': json.loads(result[3]),
-                'column_profiles': json.loads(result[4]),
+                'summary': _loads(result[3]),
+                'column_profiles': _loads(result[4]),
                 'created_at': result[5]
             }
         return None
     
     def get_latest_anomalies(self, dataset_name: str) -> Dict[str, Any]:
         """Retrieve the latest anomaly detection results for a dataset."""
-        query = """
-            SELECT * FROM data_anomalies
-            WHERE dataset_name = ?
-            ORDER BY comparison_date DESC
-            LIMIT 1
-        """
+        anomalies = ANOMALIES_TABLE.c
+        query = (
+            select(anomalies.id, anomalies.dataset_name, anomalies.comparison_date,
+                   anomalies.summary, anomalies.column_anomalies, anomalies.new_values,
+                   anomalies.missing_values, anomalies.created_at)
+            .where(anomalies.dataset_name == dataset_name)
+            .order_by(anomalies.comparison_date.desc())
+            .limit(1)
+        )
         
-        result = self.db.fetch_one(query, (dataset_name,))
+        result = self.db.fetch_one(query)
         if result:
             return {
                 'id': result[0],
                 'dataset_name': result[1],
                 'comparison_date': result[2],
-                'summary': json.loads(result[3]),
-                'column_anomalies': json.loads(result[4]),
-                'new_values': json.loads(result[5]),
-                'missing_values': json.loads(result[6]),
+                'summary': _loads(result[3]),
+                'column_anomalies': _loads(result[4]),
+                'new_values': _loads(result[5]),
+                'missing_values': _loads(result[6]),
                 'created_at': result[7]
             }
         return None
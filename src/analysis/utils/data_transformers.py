@@ -3,17 +3,41 @@
 import pandas as pd
 import polars as pl
 import numpy as np
-from datetime import time
+import pyarrow as pa
 from typing import Dict
 from logging import getLogger
 
 logger = getLogger(__name__)
 
-def flatten_json(df: pd.DataFrame) -> pd.DataFrame:
-    """Flatten nested JSON structures in DataFrame while preserving other data types."""
+# Arrow types matching the Polars dtypes chosen by to_polars
+_ARROW_TYPES = {
+    pl.Int32: pa.int32(),
+    pl.Int64: pa.int64(),
+    pl.Float64: pa.float64(),
+    pl.Date: pa.date32(),
+    pl.Datetime: pa.timestamp('us'),
+    pl.Utf8: pa.large_string()
+}
+
+def _scatter(values: list, mask: np.ndarray) -> np.ndarray:
+    """Place per-row values at the masked positions of an object array, NA elsewhere."""
+    out = np.full(len(mask), pd.NA, dtype=object)
+    out[mask] = pd.Series(values, dtype=object).to_numpy()
+    return out
+
+def flatten_json(df: pd.DataFrame, max_level: int = 1) -> pd.DataFrame:
+    """Flatten nested JSON structures in DataFrame while preserving other data types.
+    
+    Args:
+        df: DataFrame to flatten
+        max_level: Levels of dict nesting expanded below each column; deeper
+            structures are kept as values since flattening grows with fan-out
+    """
     try:
-        # Copy to avoid modifying original
-        df = df.copy()
+        # New columns are collected and applied at the end, so the input is
+        # never modified and flat frames are returned without any copy
+        to_add = {}
+        to_drop = []
         
         # Find columns containing JSON/dict structures
         for col in df.columns:
@@ -28,57 +52,55 @@ def flatten_json(df: pd.DataFrame) -> pd.DataFrame:
                 samples = non_null_values.head(sample_size)
                 
                 # Check if ANY sampled values are dict or list
-                has_nested = any(isinstance(x, (dict, list)) for x in samples)
-                if not has_nested:
+                sample = next((x for x in samples if isinstance(x, (dict, list))), None)
+                if sample is None:
                     continue
                 
-                # Create a new column for non-nested values
-                df[f"{col}_value"] = df[col].apply(
-                    lambda x: x if not isinstance(x, (dict, list)) and pd.notna(x) else pd.NA
+                # Classify every value once: 0 = scalar, 1 = dict, 2 = list
+                values = df[col].to_numpy()
+                kinds = np.fromiter(
+                    (2 if isinstance(x, list) else 1 if isinstance(x, dict) else 0 for x in values),
+                    dtype=np.int8, count=len(values)
                 )
+                is_dict = kinds == 1
+                is_list = kinds == 2
+                
+                # Create a new column for non-nested values
+                to_add[f"{col}_value"] = df[col].where((kinds == 0) & df[col].notna().to_numpy(), pd.NA)
                 
                 # Process nested structures
-                nested_values = df[df[col].apply(lambda x: isinstance(x, (dict, list)) if pd.notna(x) else False)]
-                if not nested_values.empty:
-                    sample = next((x for x in samples if isinstance(x, (dict, list))), None)
-                    if isinstance(sample, dict):
-                        # For dictionary, create new columns
-                        for key in sample.keys():
-                            new_col = f"{col}_{key}"
-                            df[new_col] = df[col].apply(
-                                lambda x: x.get(key) if isinstance(x, dict) else pd.NA
-                            )
-                    elif isinstance(sample, list) and sample:
-                        # For lists, create columns for common keys if elements are dicts
-                        if isinstance(sample[0], dict):
-                            # Get all unique keys from all dictionaries in lists
-                            keys = set()
-                            df[col].dropna().apply(
-                                lambda x: [keys.update(item.keys()) 
-                                         for item in x if isinstance(item, dict)]
-                                if isinstance(x, list) else None
-                            )
-                            
-                            # Create columns for each key
-                            for key in keys:
-                                new_col = f"{col}_{key}"
-                                df[new_col] = df[col].apply(
-                                    lambda x: [item.get(key) for item in x if isinstance(item, dict)]
-                                    if isinstance(x, list) else pd.NA
-                                )
-                        else:
-                            # For simple lists, store the length and values
-                            df[f"{col}_length"] = df[col].apply(
-                                lambda x: len(x) if isinstance(x, list) and pd.notna(x) else pd.NA
-                            )
-                            df[f"{col}_items"] = df[col].apply(
-                                lambda x: x if isinstance(x, list) and pd.notna(x) else pd.NA
-                            )
+                if isinstance(sample, dict):
+                    # For dictionary, normalize all dict rows at once into key columns
+                    nested = pd.json_normalize(values[is_dict].tolist(), sep="_", max_level=max_level)
+                    nested.index = np.flatnonzero(is_dict)
+                    nested = nested.reindex(range(len(values)))
+                    for key in nested.columns:
+                        to_add[f"{col}_{key}"] = nested[key].to_numpy()
+                elif sample:
+                    list_values = values[is_list]
+                    # For lists, create columns for common keys if elements are dicts
+                    if isinstance(sample[0], dict):
+                        # Get all unique keys from all dictionaries in lists
+                        keys = set().union(*(
+                            item.keys() for x in list_values for item in x if isinstance(item, dict)
+                        ))
+                        
+                        # Create columns for each key
+                        for key in keys:
+                            to_add[f"{col}_{key}"] = _scatter([
+                                [item.get(key) for item in x if isinstance(item, dict)]
+                                for x in list_values
+                            ], is_list)
+                    else:
+                        # For simple lists, store the length and values
+                        to_add[f"{col}_length"] = _scatter([len(x) for x in list_values], is_list)
+                        to_add[f"{col}_items"] = _scatter(list(list_values), is_list)
                 
-                # Drop the original nested column only if we created new columns
-                if len(df.columns) > len(df.columns.drop(col)):
-                    df = df.drop(columns=[col])
+                # Drop the original nested column
+                to_drop.append(col)
         
+        if to_drop:
+            df = df.drop(columns=to_drop).assign(**to_add)
         return df
     except Exception as e:
         logger.error(f"Error flattening JSON: {e}")
@@ -88,13 +110,15 @@ def to_polars(df: pd.DataFrame) -> pl.DataFrame:
     """Convert pandas DataFrame to Polars DataFrame with proper type handling."""
     try:
         # Detect numeric and datetime columns
-        num_cols = df.select_dtypes(include=['int', 'float']).columns.tolist()
+        num_cols = df.select_dtypes(include='number').columns.tolist()
         date_cols = []
         datetime_cols = []
         
         # Identify date and datetime columns
         for col in df.select_dtypes(include=['datetime64', 'datetime64[ns]']).columns:
-            if all(pd.notna(t) and t.time() == time(0, 0) for t in df[col].dropna()):
+            # Dates are datetimes that all fall exactly on midnight
+            values = df[col].dropna().to_numpy()
+            if (values == values.astype('datetime64[D]')).all():
                 date_cols.append(col)
             else:
                 datetime_cols.append(col)
@@ -105,6 +129,9 @@ def to_polars(df: pd.DataFrame) -> pl.DataFrame:
             if col in num_cols:
                 if df[col].isna().any():
                     schema[col] = pl.Float64
+                elif df[col].dtype.kind == 'f' and not (np.trunc(df[col].to_numpy()) == df[col].to_numpy()).all():
+                    # Fractional values stay floats rather than being truncated
+                    schema[col] = pl.Float64
                 else:
                     # Check if values are within int32 or int64 range
                     min_val = df[col].min()
@@ -127,20 +154,27 @@ def to_polars(df: pd.DataFrame) -> pl.DataFrame:
                     try:
                         # Check if column contains bytes
                         if df[col].notna().any() and isinstance(df[col].iloc[0], bytes):
-                            df[col] = df[col].apply(lambda x: x.decode('utf-8') if isinstance(x, bytes) else x)
+                            # Pure bytes columns decode in one vectorized pass; str.decode
+                            # would turn any str values into NaN, so mixed columns go per element
+                            if pd.api.types.infer_dtype(df[col], skipna=True) == 'bytes':
+                                df[col] = df[col].str.decode('utf-8')
+                            else:
+                                df[col] = df[col].apply(lambda x: x.decode('utf-8') if isinstance(x, bytes) else x)
                     except Exception as e:
                         logger.warning(f"Error converting bytes to string in column {col}: {e}")
                 schema[col] = pl.Utf8
 
         try:
-            # For date/datetime columns, ensure they're in the correct format
-            for col in date_cols:
-                df[col] = pd.to_datetime(df[col]).dt.date
-            for col in datetime_cols:
-                df[col] = pd.to_datetime(df[col])
-                
-            # Convert DataFrame with explicit schema
-            return pl.from_pandas(df, schema_overrides=schema)
+            # Convert through Arrow, casting every column to its schema type in
+            # one step; integer targets were checked above to be integral and in
+            # range, so the unchecked cast only drops sub-microsecond precision
+            # from timestamps
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            arrow_schema = pa.schema([
+                pa.field(name, _ARROW_TYPES[schema[col]])
+                for name, col in zip(table.column_names, df.columns)
+            ])
+            return pl.from_arrow(table.cast(arrow_schema, safe=False))
         except Exception as e:
             logger.warning(f"Error in final Polars conversion: {e}")
             # Fallback: convert everything to strings
@@ -154,60 +188,3 @@ def to_polars(df: pd.DataFrame) -> pl.DataFrame:
     except Exception as e:
         logger.error(f"Error converting DataFrame to Polars: {e}")
         raise
-
-def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
-    """Optimize DataFrame memory usage by converting to appropriate dtypes."""
-    try:
-        # Process numeric columns
-        numeric_cols = df.select_dtypes(include=['int', 'float']).columns
-        for col in numeric_cols:
-            # Skip if column is all null
-            if df[col].isna().all():
-                continue
-                
-            # Get min and max values
-            col_min = df[col].min()
-            col_max = df[col].max()
-            
-            # Convert to smallest possible integer type if no nulls
-            if not df[col].isna().any() and col_min.is_integer() and col_max.is_integer():
-                if col_min >= 0:
-                    if col_max <= 255:
-                        df[col] = df[col].astype(np.uint8)
-                    elif col_max <= 65535:
-                        df[col] = df[col].astype(np.uint16)
-                    elif col_max <= 4294967295:
-                        df[col] = df[col].astype(np.uint32)
-                    else:
-                        df[col] = df[col].astype(np.uint64)
-                else:
-                    if col_min >= -128 and col_max <= 127:
-                        df[col] = df[col].astype(np.int8)
-                    elif col_min >= -32768 and col_max <= 32767:
-                        df[col] = df[col].astype(np.int16)
-                    elif col_min >= -2147483648 and col_max <= 2147483647:
-                        df[col] = df[col].astype(np.int32)
-                    else:
-                        df[col] = df[col].astype(np.int64)
-            # Convert to float32 if precision allows
-            elif not df[col].isna().any():
-                float32_series = df[col].astype(np.float32)
-                if (df[col] - float32_series).abs().max() < 1e-6:
-                    df[col] = float32_series
-        
-        # Process string columns
-        object_cols = df.select_dtypes(include=['object']).columns
-        for col in object_cols:
-            # Skip if column is all null
-            if df[col].isna().all():
-                continue
-                
-            # Convert to category if beneficial
-            nunique = df[col].nunique()
-            if nunique / len(df) < 0.5:  # Convert if less than 50% unique values
-                df[col] = df[col].astype('category')
-        
-        return df
-    except Exception as e:
-        logger.error(f"Error optimizing dtypes: {e}")
-        return df
@@ -6,6 +6,8 @@ import polars as pl
 import numpy as np
 from typing import Any, Dict
 import json
+import orjson
+import ormsgpack
 from logging import getLogger
 
 logger = getLogger(__name__)
@@ -44,3 +46,45 @@ def convert_polars_types(obj: Any) -> Any:
     if pd.isna(obj):
         return None
     return obj
+
+# NumPy values, datetimes and non-string keys are serialized natively by orjson
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the values orjson does not handle natively."""
+    if isinstance(obj, pl.Series):
+        return obj.to_list()
+    if isinstance(obj, pl.DataFrame):
+        return {name: dict(enumerate(values)) for name, values in obj.to_dict(as_series=False).items()}
+    if isinstance(obj, pd.Timestamp):
+        return obj.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (np.ndarray, pd.Series)):
+        # Arrays orjson rejects (object dtype, non-contiguous) and pandas Series
+        return obj.tolist()
+    if pd.api.types.is_scalar(obj) and pd.isna(obj):
+        return None
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def to_json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize analysis results to UTF-8 JSON in a single orjson pass.
+    
+    Equivalent to convert_polars_types followed by json.dumps, without
+    walking the object graph in Python first.
+    
+    Args:
+        obj: Result object to serialize
+        indent: Pretty-print with two-space indentation
+    """
+    option = JSON_OPTIONS | orjson.OPT_INDENT_2 if indent else JSON_OPTIONS
+    return orjson.dumps(obj, default=_json_default, option=option)
+
+def to_msgpack_bytes(obj: Any) -> bytes:
+    """Serialize analysis results to MessagePack, converting values like to_json_bytes.
+    
+    Args:
+        obj: Result object to serialize
+    """
+    option = ormsgpack.OPT_SERIALIZE_NUMPY | ormsgpack.OPT_NON_STR_KEYS
+    return ormsgpack.packb(obj, default=_json_default, option=option)
@@ -1,21 +1,31 @@
 """FastAPI-based REST API for data ingestion and analysis."""
-from fastapi import FastAPI, File, UploadFile, HTTPException, Query
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Request, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+import aiofiles
+import aiofiles.os
+import zstandard
 import pandas as pd
-import numpy as np
 import json
+import orjson
+import ijson
 import os
 import logging
 import io
-from typing import Dict, Any, List, Optional
+import asyncio
+import copy
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from src.database import db
-from src.ai_analysis import ai_analyzer
+from src.ai_analysis import get_ai_analyzer
 from src.analysis.core.data_analyzer import DataAnalyzer
-from src.analysis.utils.type_converters import convert_polars_types, DateTimeEncoder
+from src.analysis.utils.type_converters import to_json_bytes, to_msgpack_bytes
 from src.validation.data_validator import validate_data
 from src.validation.rule_storage import RuleStorage
 
@@ -23,21 +33,236 @@ from src.validation.rule_storage import RuleStorage
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def convert_numpy_types(obj: Any) -> Any:
-    """Convert numpy types to Python native types for JSON serialization."""
-    if isinstance(obj, (np.integer, np.int64)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64)):
-        return float(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, (np.ndarray, pd.Series)):
-        return [convert_numpy_types(x) for x in obj]
-    elif isinstance(obj, dict):
-        return {k: convert_numpy_types(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(x) for x in obj]
-    return obj
+class AnalysisJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, accepting NumPy and Polars values."""
+    
+    def render(self, content: Any) -> bytes:
+        return to_json_bytes(content)
+
+class AnalysisMsgpackResponse(Response):
+    """MessagePack response for clients that send Accept: application/msgpack."""
+    media_type = "application/msgpack"
+    
+    def render(self, content: Any) -> bytes:
+        return to_msgpack_bytes(content)
+
+def analysis_response(request: Request, content: Any) -> Response:
+    """Encode an analysis result as MessagePack if the client accepts it, else JSON."""
+    if AnalysisMsgpackResponse.media_type in request.headers.get("accept", ""):
+        return AnalysisMsgpackResponse(content)
+    return AnalysisJSONResponse(content)
+
+def write_output_file(output_file: str, result: Dict[str, Any]) -> None:
+    """Write an analysis result to disk as indented JSON.
+    
+    Runs as a background task after the response is sent, so failures are
+    logged rather than reported to the client. Paths ending in .zst are
+    written zstd-compressed.
+    """
+    try:
+        # Create output directory if it doesn't exist
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        
+        payload = to_json_bytes(result, indent=True)
+        if output_file.endswith(".zst"):
+            payload = zstandard.ZstdCompressor(level=3).compress(payload)
+        with open(output_file, 'wb') as f:
+            f.write(payload)
+        
+        logger.info(f"Analysis results written to {output_file}")
+    except Exception as e:
+        logger.error(f"Error writing to JSON file: {e}")
+
+async def read_rules_file(rules_file: UploadFile) -> List[Dict[str, Any]]:
+    """Read an uploaded rules file and return its 'rules' list.
+    
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    return orjson.loads(await rules_file.read()).get('rules', [])
+
+def looks_like_json_lines(head: bytes) -> bool:
+    """Check whether the first bytes of a JSON file hold one object per line."""
+    return head.lstrip().startswith(b'{') and b'\n{' in head.replace(b'\r\n', b'\n')
+
+def iter_json_array_batches(file_path: str):
+    """Stream a top-level JSON array, yielding normalized frames of JSON_STREAM_BATCH records."""
+    with open(file_path, 'rb') as f:
+        batch = []
+        for record in ijson.items(f, 'item', use_float=True):
+            batch.append(record)
+            if len(batch) == JSON_STREAM_BATCH:
+                yield pd.json_normalize(batch)
+                batch = []
+        if batch:
+            yield pd.json_normalize(batch)
+
+def read_csv_file(file_path: str) -> pd.DataFrame:
+    """Read a CSV file; the Arrow reader parses and infers types on all cores."""
+    return pd.read_csv(file_path, engine='pyarrow')
+
+def read_json_file(file_path: str) -> pd.DataFrame:
+    """Read a JSON document or JSON Lines file, flattening nested records."""
+    with open(file_path, 'rb') as f:
+        head = f.read(JSON_SNIFF_BYTES)
+    
+    # JSON Lines files are recognised from their first bytes instead of
+    # failing a full single-document parse first
+    if looks_like_json_lines(head):
+        try:
+            return pd.read_json(file_path, lines=True)
+        except ValueError:
+            # Pretty-printed documents can also start lines with '{'
+            logger.info(f"{file_path} is not JSON Lines, reading it as one document")
+    
+    # Large top-level arrays are streamed in batches so the whole document
+    # never exists as one Python object graph
+    if head.lstrip().startswith(b'[') and os.path.getsize(file_path) > JSON_STREAM_THRESHOLD:
+        frames = list(iter_json_array_batches(file_path))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    
+    # Try regular JSON first, parsed by orjson's SIMD-accelerated reader
+    try:
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
+        return pd.json_normalize(data)
+    except:
+        # If that fails, try reading as JSON Lines
+        return pd.read_json(file_path, lines=True)
+
+# Reader for each supported upload extension
+READERS: Dict[str, Callable[[str], pd.DataFrame]] = {
+    'csv': read_csv_file,
+    'xlsx': pd.read_excel,
+    'xls': pd.read_excel,
+    'json': read_json_file
+}
+
+# Extensions whose parsed tables are cached as Parquet
+PARQUET_CACHED_EXTENSIONS = frozenset(['csv', 'xlsx', 'xls'])
+
+def read_uploaded_file(file_path: str, ext: str) -> pd.DataFrame:
+    """Read an uploaded data file into a DataFrame.
+    
+    CSV and Excel files are parsed once and cached as a zstd-compressed
+    Parquet copy, which is reused until the source file changes.
+    
+    Args:
+        file_path: Path of the uploaded file
+        ext: Lower-case file extension
+    """
+    reader = READERS.get(ext)
+    if reader is None:
+        raise ValueError(f"Unsupported file type: {ext}")
+    if ext not in PARQUET_CACHED_EXTENSIONS:
+        return reader(file_path)
+    
+    cache_path = os.path.join(PARQUET_CACHE_DIR, os.path.basename(file_path) + ".parquet")
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+        # Touch the entry so eviction drops the least recently used copies
+        os.utime(cache_path)
+        return pd.read_parquet(cache_path)
+    
+    df = reader(file_path)
+    
+    # Cache the parsed table; columns Arrow cannot type simply stay uncached
+    try:
+        os.makedirs(PARQUET_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, compression='zstd', index=False)
+        os.replace(tmp_path, cache_path)
+        prune_parquet_cache()
+    except Exception as e:
+        logger.warning(f"Could not cache {file_path} as Parquet: {e}")
+    return df
+
+def prune_parquet_cache() -> None:
+    """Bound the Parquet cache.
+    
+    Entries whose uploaded file is gone are deleted, then the least recently
+    used entries until the cache fits in PARQUET_CACHE_MAX_BYTES.
+    """
+    entries = []
+    with os.scandir(PARQUET_CACHE_DIR) as scan:
+        for entry in scan:
+            if not entry.is_file() or not entry.name.endswith(".parquet"):
+                continue
+            source = os.path.join(UPLOAD_DIR, entry.name[:-len(".parquet")])
+            if not os.path.exists(source):
+                remove_cache_entry(entry.path)
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= PARQUET_CACHE_MAX_BYTES:
+            break
+        remove_cache_entry(path)
+        total -= size
+
+def remove_cache_entry(path: str) -> None:
+    """Delete a cache file that a concurrent prune may already have removed."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def load_uploaded_file(file_path: str, ext: str) -> pd.DataFrame:
+    """Read an uploaded file, reporting parse failures as a 400 error."""
+    try:
+        return read_uploaded_file(file_path, ext)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
+
+def file_quality_metrics(file_path: str, ext: str, mtime_ns: int,
+                         size: int) -> Tuple[Optional[Dict[str, Any]], Optional[pd.DataFrame]]:
+    """Analyze an uploaded file, memoized on its modification time and size.
+    
+    Returns the metrics together with the frame they were computed from, so
+    callers needing the data do not parse the file a second time; on a cache
+    hit the frame is None. Metrics are None when the file holds no rows.
+    Failed analyses are not cached. The least recently used entry is evicted
+    once QUALITY_CACHE_SIZE files are cached, and callers get their own copy
+    of the metrics, free to modify.
+    """
+    key = (file_path, ext, mtime_ns, size)
+    with _quality_cache_lock:
+        if key in _quality_cache:
+            _quality_cache.move_to_end(key)
+            return copy.deepcopy(_quality_cache[key]), None
+    
+    # Analysis runs outside the lock so other files are served meanwhile
+    df = load_uploaded_file(file_path, ext)
+    metrics = None if df.empty else data_analyzer.analyze_data_quality(df)
+    if metrics is None or "error" not in metrics:
+        with _quality_cache_lock:
+            _quality_cache[key] = copy.deepcopy(metrics)
+            _quality_cache.move_to_end(key)
+            if len(_quality_cache) > QUALITY_CACHE_SIZE:
+                _quality_cache.popitem(last=False)
+    return metrics, df
+
+async def table_quality_metrics(schema: str, table_name: str,
+                                database: Optional[str]) -> Dict[str, Any]:
+    """Compute quality metrics with aggregate queries run inside the database.
+    
+    Column statistics come from one aggregate SELECT; the most frequent values
+    of non-numeric columns are fetched with one GROUP BY query per column,
+    issued concurrently from worker threads but never more at once than the
+    connection pool holds.
+    """
+    profile = await asyncio.to_thread(db.profile_table, table_name, schema=schema, database=database)
+    categorical = [name for name, stats in profile['columns'].items() if 'mean' not in stats]
+    
+    connections = asyncio.Semaphore(db.pool_size(database))
+    
+    async def fetch_top_values(name: str) -> List[Dict[str, Any]]:
+        async with connections:
+            return await asyncio.to_thread(db.top_values, table_name, name, schema=schema, database=database)
+    
+    top_values = await asyncio.gather(*(fetch_top_values(name) for name in categorical))
+    return DataAnalyzer.from_database_profile(profile, dict(zip(categorical, top_values)))
 
 # Initialize analyzers and rule storage
 data_analyzer = DataAnalyzer()
@@ -46,7 +271,8 @@ rule_storage = RuleStorage()
 app = FastAPI(
     title="Data Ingestion API",
     description="API for uploading and analyzing data files",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=AnalysisJSONResponse
 )
 
 # Add CORS middleware
@@ -60,6 +286,17 @@ app.add_middleware(
 
 # Constants
 UPLOAD_DIR = "uploads"
+PARQUET_CACHE_DIR = os.path.join(UPLOAD_DIR, ".parquet_cache")
+PARQUET_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+JSON_SNIFF_BYTES = 4096
+JSON_STREAM_THRESHOLD = 100 * 1024 * 1024
+JSON_STREAM_BATCH = 50_000
+
+# Quality metrics per uploaded file, keyed by path, type, mtime and size
+QUALITY_CACHE_SIZE = 256
+_quality_cache: "OrderedDict[tuple, Optional[Dict[str, Any]]]" = OrderedDict()
+_quality_cache_lock = threading.Lock()
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -96,15 +333,18 @@ async def list_files() -> List[Dict[str, Any]]:
     """List uploaded files."""
     try:
         files = []
-        for filename in os.listdir(UPLOAD_DIR):
-            file_path = os.path.join(UPLOAD_DIR, filename)
-            if os.path.isfile(file_path):
-                files.append({
-                    "name": filename,
-                    "path": f"/uploads/{filename}",
-                    "size": os.path.getsize(file_path),
-                    "modified": datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
-                })
+        # scandir entries carry their type, and stat() is fetched once per file
+        with os.scandir(UPLOAD_DIR) as entries:
+            for entry in entries:
+                # Dotfiles are in-progress uploads, not listable files
+                if entry.is_file() and not entry.name.startswith('.'):
+                    stat = entry.stat()
+                    files.append({
+                        "name": entry.name,
+                        "path": f"/uploads/{entry.name}",
+                        "size": stat.st_size,
+                        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    })
         return files
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -116,12 +356,18 @@ async def list_database_tables(
 ):
     """List available tables in database."""
     try:
-        return db.list_tables(database=database, schema=schema)
+        return await asyncio.to_thread(db.list_tables, database=database, schema=schema)
     except ValueError as ve:
         raise HTTPException(status_code=404, detail=str(ve))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/tables/refresh")
+async def refresh_table_metadata():
+    """Discard cached table metadata, e.g. after tables were created or altered."""
+    db.clear_metadata_cache()
+    return {"status": "success"}
+
 @app.get("/tables/{schema}/{table_name}")
 async def get_table_info(
     schema: str,
@@ -130,7 +376,7 @@ async def get_table_info(
 ):
     """Get table metadata."""
     try:
-        return db.get_table_info(f"{schema}.{table_name}", database=database)
+        return await asyncio.to_thread(db.get_table_info, f"{schema}.{table_name}", database=database)
     except ValueError as ve:
         raise HTTPException(status_code=404, detail=str(ve))
     except Exception as e:
@@ -138,22 +384,44 @@ async def get_table_info(
 
 @app.post("/analyze/table/{schema}/{table_name}")
 async def analyze_table(
+    request: Request,
+    background_tasks: BackgroundTasks,
     schema: str,
     table_name: str,
     database: Optional[str] = Query(None, description="Database to use"),
     use_ai: bool = Query(True, description="Use AI for advanced analysis"),
-    output_file: Optional[str] = Query(None, description="Optional JSON output file path"),
+    output_file: Optional[str] = Query(None, description="Optional JSON output file path (zstd-compressed if it ends in .zst)"),
+    in_database: bool = Query(False, description="Compute statistics inside the database instead of reading all rows"),
     rules_file: Optional[UploadFile] = File(None, description="Optional JSON file containing validation rules")
 ):
     """Analyze table data with optional AI-powered insights."""
     try:
-        # Read table data
-        df = db.read_table(table_name, schema=schema, database=database)
+        # Validation needs the rows themselves, so aggregates are only pushed
+        # down to the database when no rules are given
+        if in_database and not rules_file:
+            try:
+                quality_metrics = await table_quality_metrics(schema, table_name, database)
+            except Exception as e:
+                logger.warning(f"In-database analysis failed, reading table instead: {e}")
+            else:
+                info = await asyncio.to_thread(db.get_table_info, f"{schema}.{table_name}", database=database)
+                result = {
+                    "schema": schema,
+                    "table_name": table_name,
+                    "metadata": info,
+                    "analysis_timestamp": datetime.now().isoformat(),
+                    "quality_metrics": quality_metrics
+                }
+                if output_file:
+                    background_tasks.add_task(write_output_file, output_file, result)
+                return analysis_response(request, result)
+        
+        # Read table data; blocking I/O and analysis run in worker threads so
+        # the event loop keeps serving other requests
+        df = await asyncio.to_thread(db.read_table, table_name, schema=schema, database=database)
         
         # Get table info
-        info = db.get_table_info(f"{schema}.{table_name}", database=database)
-
-        logger.info(f"Table info: {df.dtypes}")
+        info = await asyncio.to_thread(db.get_table_info, f"{schema}.{table_name}", database=database)
         
         if df.empty:
             result = {
@@ -164,18 +432,19 @@ async def analyze_table(
                 "columns": []
             }
         else:
+            # Lazy formatting: the dtypes are only rendered when INFO is enabled
+            logger.info("Table info: %s", df.dtypes)
+            
             # Get analysis results
-            quality_metrics = data_analyzer.analyze_data_quality(df)
+            quality_metrics = await asyncio.to_thread(data_analyzer.analyze_data_quality, df)
 
             # Get validation rules if provided
             validation_rules = []
             if rules_file:
-                rules_contents = await rules_file.read()
-                rules_json = json.loads(rules_contents)
-                validation_rules = rules_json.get('rules', [])
+                validation_rules = await read_rules_file(rules_file)
 
             # Validate data using Great Expectations
-            validation_result = validate_data(df, validation_rules)
+            validation_result = await asyncio.to_thread(validate_data, df, validation_rules)
             
             # Prepare the complete result
             result = {
@@ -187,29 +456,18 @@ async def analyze_table(
                 "validation_result": validation_result
             }
 
-        # Convert all data types to JSON-serializable format
+        # Serialize the result directly, converting NumPy/Polars values on the way
         try:
-            json_ready_result = convert_polars_types(result)
+            response = analysis_response(request, result)
         except Exception as e:
             logger.error(f"Error converting data types: {e}")
             raise HTTPException(status_code=500, detail=f"Error converting data types: {str(e)}")
 
-        # Write to JSON file if output path is provided
+        # Write to JSON file after the response has been sent, if a path is provided
         if output_file:
-            try:
-                # Create output directory if it doesn't exist
-                os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
-                
-                # Write to JSON file with proper encoding and formatting
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(json_ready_result, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
-                
-                logger.info(f"Analysis results written to {output_file}")
-            except Exception as e:
-                logger.error(f"Error writing to JSON file: {e}")
-                raise HTTPException(status_code=500, detail=f"Error writing to JSON file: {str(e)}")
+            background_tasks.add_task(write_output_file, output_file, result)
 
-        return json_ready_result
+        return response
 
     except Exception as e:
         logger.error(f"Error analyzing table: {e}")
@@ -225,24 +483,7 @@ async def analyze_existing_file(filename: str, use_ai: bool = Query(True, descri
 
         # Read the file based on its extension
         ext = filename.lower().split('.')[-1]
-        try:
-            if ext == 'csv':
-                df = pd.read_csv(file_path)
-            elif ext in ['xlsx', 'xls']:
-                df = pd.read_excel(file_path)
-            elif ext == 'json':
-                # Try regular JSON first
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                    df = pd.json_normalize(data)
-                except:
-                    # If that fails, try reading as JSON Lines
-                    df = pd.read_json(file_path, lines=True)
-            else:
-                raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}")
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
+        df = await asyncio.to_thread(load_uploaded_file, file_path, ext)
 
         if df.empty:
             return {
@@ -264,6 +505,7 @@ async def analyze_existing_file(filename: str, use_ai: bool = Query(True, descri
 
 @app.post("/analyze/quality/{filename}")
 async def analyze_file_quality(
+    request: Request,
     filename: str,
     use_ai: bool = Query(True, description="Use AI for advanced analysis"),
     rules_file: Optional[UploadFile] = File(None, description="Optional JSON file containing validation rules")
@@ -274,28 +516,15 @@ async def analyze_file_quality(
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="File not found")
 
-        # Read the file based on its extension
+        # Use DataAnalyzer for comprehensive data quality analysis, reusing the
+        # result while the file is unchanged
         ext = filename.lower().split('.')[-1]
-        try:
-            if ext == 'csv':
-                df = pd.read_csv(file_path)
-            elif ext in ['xlsx', 'xls']:
-                df = pd.read_excel(file_path)
-            elif ext == 'json':
-                # Try regular JSON first
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                    df = pd.json_normalize(data)
-                except:
-                    # If that fails, try reading as JSON Lines
-                    df = pd.read_json(file_path, lines=True)
-            else:
-                raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}")
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
+        stat = os.stat(file_path)
+        quality_metrics, df = await asyncio.to_thread(
+            file_quality_metrics, file_path, ext, stat.st_mtime_ns, stat.st_size
+        )
 
-        if df.empty:
+        if quality_metrics is None:
             return {
                 "filename": filename,
                 "status": "No data found",
@@ -303,17 +532,17 @@ async def analyze_file_quality(
                 "ai_insights": None
             }
 
-        # Use DataAnalyzer for comprehensive data quality analysis
-        quality_metrics = data_analyzer.analyze_data_quality(df)
+        # The frame itself is only needed for validation and AI insights, and
+        # is only read again when the metrics came from the cache
+        if df is None and (rules_file or use_ai):
+            df = await asyncio.to_thread(load_uploaded_file, file_path, ext)
 
         # Add validation result if rules are provided
         validation_result = None
         saved_rules_info = None
         if rules_file:
             # Read rules file
-            rules_contents = await rules_file.read()
-            rules_json = json.loads(rules_contents)
-            validation_rules = rules_json.get('rules', [])
+            validation_rules = await read_rules_file(rules_file)
             
             # Save the rules
             try:
@@ -328,7 +557,7 @@ async def analyze_file_quality(
                 logger.warning(f"Failed to save rules: {e}")
             
             # Perform validation
-            validation_result = validate_data(df, validation_rules)
+            validation_result = await asyncio.to_thread(validate_data, df, validation_rules)
         
         # Add AI insights if requested
         ai_insights = None
@@ -339,20 +568,21 @@ async def analyze_file_quality(
                     "filename": filename,
                     "file_type": ext
                 }
-                ai_analysis = ai_analyzer.analyze_dataframe(df, context=context)
-                ai_insights = convert_numpy_types(ai_analysis.get("ai_insights"))
+                ai_analyzer = await asyncio.to_thread(get_ai_analyzer)
+                ai_analysis = await ai_analyzer.analyze_dataframe_async(df, context=context)
+                ai_insights = ai_analysis.get("ai_insights")
             except Exception as e:
                 logger.error(f"AI analysis error: {e}")
                 ai_insights = {"error": str(e)}
 
-        return {
+        return analysis_response(request, {
             "filename": filename,
             "status": "Success",
             "quality_metrics": quality_metrics,
             "validation_result": validation_result,
             "saved_rules_info": saved_rules_info,
             "ai_insights": ai_insights
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -370,26 +600,38 @@ async def upload_file(
         os.makedirs(UPLOAD_DIR, exist_ok=True)
         
         # Validate file extension
-        allowed_extensions = ['csv', 'xlsx', 'xls', 'json']
         file_extension = file.filename.split('.')[-1].lower()
-        if file_extension not in allowed_extensions:
+        if file_extension not in READERS:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_extension}")
         
-        # Create a unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_filename = f"{timestamp}_{file.filename}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-        # Save the uploaded file
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # Save the uploaded file in 1 MiB chunks so memory stays bounded,
+        # without blocking the event loop on disk writes, hashing it on the way
+        tmp_path = os.path.join(UPLOAD_DIR, f".{uuid.uuid4().hex}.part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    await f.write(chunk)
+                    size += len(chunk)
+            
+            # Name the file by its content so repeated uploads map to one file;
+            # an existing copy is kept untouched, preserving its cached analysis
+            unique_filename = f"{digest.hexdigest()[:16]}_{file.filename}"
+            file_path = os.path.join(UPLOAD_DIR, unique_filename)
+            if not await aiofiles.os.path.exists(file_path):
+                await aiofiles.os.replace(tmp_path, file_path)
+        finally:
+            # Drop the partial file of a failed or duplicate upload
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
         
         # Return basic file info without analysis
         return {
             "filename": unique_filename,
             "original_filename": file.filename,
-            "size": len(content),
+            "size": size,
             "path": f"/uploads/{unique_filename}",
             "upload_time": datetime.now().isoformat()
         }
@@ -405,16 +647,14 @@ async def validate(file: UploadFile = File(...), rules_file: UploadFile = File(.
     """Validate data against business rules."""
     try:
         # Step 1: Read business rules from the uploaded file (assumed to be JSON)
-        rules_contents = await rules_file.read()
-        rules_json = json.loads(rules_contents)
-        rules = rules_json.get('rules', [])
+        rules = await read_rules_file(rules_file)
 
-        # Step 2: Read the CSV file into a DataFrame
+        # Step 2: Read the CSV file into a DataFrame, parsing in a worker thread
         contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
+        df = await asyncio.to_thread(pd.read_csv, io.BytesIO(contents), engine='pyarrow')
 
         # Step 3: Validate the DataFrame based on the rules
-        validation_result = validate_data(df, rules)
+        validation_result = await asyncio.to_thread(validate_data, df, rules)
         return validation_result
 
     except Exception as e:
@@ -426,9 +666,7 @@ async def save_rules(rules_file: UploadFile = File(...), name: Optional[str] = N
     """Save business rules from a JSON file to the rules storage."""
     try:
         # Read the rules file
-        contents = await rules_file.read()
-        rules_json = json.loads(contents)
-        rules = rules_json.get('rules', [])
+        rules = await read_rules_file(rules_file)
         
         # Use the original filename if no name provided
         if not name:
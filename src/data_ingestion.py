@@ -10,6 +10,9 @@ from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
 
+# Rows sent to the database per INSERT batch
+INSERT_CHUNK_SIZE = 1000
+
 def ingest_csv_to_sql(
     csv_path: str,
     table_name: str,
@@ -37,19 +40,22 @@ def ingest_csv_to_sql(
             
         # Read CSV file
         logger.info(f"Reading CSV file: {csv_path}")
-        df = pd.read_csv(csv_path)
+        df = pd.read_csv(csv_path, engine='pyarrow')
         
         # Get default database engine
         engine = db.get_engine()
         
-        # Upload to SQL Server
+        # Upload in batches of executemany inserts: SQL Server engines bind
+        # each batch as one fast_executemany array, and SQLAlchemy batches the
+        # rows for other dialects without exceeding their parameter limits
         logger.info(f"Uploading data to table: {table_name}")
         df.to_sql(
             name=table_name,
             con=engine,
             if_exists=if_exists,
             index=index,
-            schema=schema
+            schema=schema,
+            chunksize=INSERT_CHUNK_SIZE
         )
         
         logger.info(f"Successfully uploaded {len(df)} rows to {table_name}")
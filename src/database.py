@@ -1,12 +1,18 @@
 """Database configuration and utilities.
 Provides database connection and query functionality with support for multiple databases.
 """
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import (create_engine, inspect, text, select, func, cast, distinct,
+                        MetaData, Table, Float, Integer, Numeric, LargeBinary, JSON, ARRAY)
+from sqlalchemy import table as table_clause, column as column_clause, bindparam
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.sql import Executable
 import pandas as pd
+import pyarrow as pa
 import yaml
 import logging
-from typing import Dict, Any, List, Optional
+import os
+import time
+from typing import Dict, Any, Iterator, List, Optional, Union
 from pathlib import Path
 from urllib.parse import quote_plus
 
@@ -17,13 +23,41 @@ logger = logging.getLogger(__name__)
 # Initialize SQLAlchemy base class for models
 Base = declarative_base()
 
+# Database configuration file read when no other path is given; the
+# DATABASE_CONFIG environment variable points it elsewhere (e.g. in tests)
+CONFIG_PATH = Path(os.environ.get('DATABASE_CONFIG')
+                   or Path(__file__).parent.parent / 'config' / 'database.yaml')
+
+# Rows fetched per batch when reading whole tables
+READ_CHUNK_SIZE = 50_000
+
+# Seconds a cached inspector (and its schema/column metadata) is reused
+INSPECTOR_TTL = 60
+
+# Dialects that expose the standard INFORMATION_SCHEMA views
+INFORMATION_SCHEMA_DIALECTS = frozenset({'mssql', 'postgresql', 'mysql'})
+
+# Catalog and built-in role schemas whose tables are never listed
+SYSTEM_SCHEMAS = frozenset({
+    'sys', 'INFORMATION_SCHEMA', 'information_schema', 'pg_catalog',
+    'mysql', 'performance_schema', 'guest', 'db_owner', 'db_accessadmin',
+    'db_securityadmin', 'db_ddladmin', 'db_backupoperator', 'db_datareader',
+    'db_datawriter', 'db_denydatareader', 'db_denydatawriter'
+})
+
 class Database:
     """Main database handler class that manages connections and queries."""
     
-    def __init__(self):
-        """Initialize database connections from config file."""
+    def __init__(self, config_path: Optional[Union[str, Path]] = None):
+        """Initialize database connections from config file.
+        
+        Args:
+            config_path: YAML configuration file (default: config/database.yaml)
+        """
+        self.config_path = Path(config_path) if config_path else CONFIG_PATH
         self.engines = {}  # Store database engines
         self.sessions = {}  # Store database sessions
+        self.inspectors = {}  # Store (inspector, created) per engine
         self.configs = self._load_config()
         
         # Print connection URL for default database
@@ -39,14 +73,14 @@ class Database:
             Dict containing database configurations
         """
         try:
-            config_path = Path(__file__).parent.parent / 'config' / 'database.yaml'
-            with open(config_path) as f:
+            with open(self.config_path) as f:
                 config = yaml.safe_load(f)
             
             # Get default database config
             default_db = config.get('default')
             if not default_db or default_db not in config['databases']:
                 raise ValueError("Default database not specified or invalid")
+            self.default_database = default_db
                 
             db_config = config['databases'][default_db]
             # Print connection details
@@ -84,18 +118,49 @@ class Database:
             if not config:
                 raise ValueError(f"Empty configuration for database '{database}'")
             
-            url = self._build_connection_url(config)
-            logger.info(f"Connection URL: {url}")
-            
-            self.engines[database] = create_engine(
-                url,
-                pool_size=config.get('pool_size', 5),
-                max_overflow=config.get('max_overflow', 10),
-                pool_timeout=config.get('pool_timeout', 30)
-            )
+            self.engines[database] = self._make_engine(config)
         
         return self.engines[database]
     
+    def _make_engine(self, config: Dict) -> Any:
+        """Create a pooled engine for a database configuration.
+        
+        Pool sizing, pre-ping and recycling can be set per database in the
+        YAML config.
+        
+        Args:
+            config: Database configuration dictionary
+            
+        Returns:
+            SQLAlchemy engine
+        """
+        url = self._build_connection_url(config)
+        logger.info(f"Connection URL: {url}")
+        
+        # pyodbc sends executemany parameters as one array instead of row by row
+        options = {'fast_executemany': True} if config['type'] == 'mssql' else {}
+        # Stale connections are detected before use and recycled before
+        # server-side idle timeouts close them
+        return create_engine(
+            url,
+            pool_size=config.get('pool_size', 5),
+            max_overflow=config.get('max_overflow', 10),
+            pool_timeout=config.get('pool_timeout', 30),
+            pool_pre_ping=config.get('pool_pre_ping', True),
+            pool_recycle=config.get('pool_recycle', 1800),
+            **options
+        )
+    
+    def pool_size(self, database: Optional[str] = None) -> int:
+        """Get the number of connections a database's pool keeps open.
+        
+        Args:
+            database: Name of database (default from config)
+        """
+        if database is None:
+            database = self._get_default_database()
+        return self.configs.get(database, {}).get('pool_size', 5)
+    
     def get_session(self, database: Optional[str] = None):
         """Get a database session for queries.
         
@@ -112,14 +177,78 @@ class Database:
             
         return self.sessions[database]()
     
+    def execute(self, statement: Union[str, Executable], params: Optional[Dict[str, Any]] = None,
+                database: Optional[str] = None) -> Optional[Any]:
+        """Run one statement in its own transaction.
+        
+        Args:
+            statement: SQLAlchemy statement, or SQL text using :name binds
+            params: Bind parameter values
+            database: Name of database to run against
+            
+        Returns:
+            Primary key of the inserted row for insert() statements, else None
+        """
+        if isinstance(statement, str):
+            statement = text(statement)
+        with self.get_connection(database).begin() as conn:
+            result = conn.execute(statement, params or {})
+            if result.is_insert:
+                return result.inserted_primary_key[0]
+            return None
+    
+    def executemany(self, statement: Union[str, Executable], param_rows: List[Dict[str, Any]],
+                    database: Optional[str] = None) -> None:
+        """Run one statement for every parameter row in a single transaction.
+        
+        SQLAlchemy sends the rows through the driver's executemany (batched
+        into multi-row inserts where the dialect supports it).
+        
+        Args:
+            statement: SQLAlchemy statement, or SQL text using :name binds
+            param_rows: One dictionary of bind values per execution
+            database: Name of database to run against
+        """
+        if isinstance(statement, str):
+            statement = text(statement)
+        with self.get_connection(database).begin() as conn:
+            conn.execute(statement, param_rows)
+    
+    def fetch_one(self, statement: Union[str, Executable], params: Optional[Dict[str, Any]] = None,
+                  database: Optional[str] = None) -> Optional[Any]:
+        """Run a query and return its first row.
+        
+        Args:
+            statement: SQLAlchemy query, or SQL text using :name binds
+            params: Bind parameter values
+            database: Name of database to query
+            
+        Returns:
+            First result row, or None if the query returned no rows
+        """
+        if isinstance(statement, str):
+            statement = text(statement)
+        with self.get_connection(database).connect() as conn:
+            return conn.execute(statement, params or {}).first()
+    
+    def create_tables(self, *tables: Table, database: Optional[str] = None) -> None:
+        """Create tables and their indexes unless they already exist.
+        
+        Args:
+            tables: SQLAlchemy tables to create
+            database: Name of database to create them in
+        """
+        engine = self.get_connection(database)
+        for table in tables:
+            table.create(engine, checkfirst=True)
+    
     def _get_default_database(self) -> str:
         """Get name of default database from config."""
         # Use already loaded config instead of loading again
-        if hasattr(self, 'configs'):
-            return self.configs.get('default', 'mssql')
+        if hasattr(self, 'default_database'):
+            return self.default_database
         
-        config_path = Path(__file__).parent.parent / 'config' / 'database.yaml'
-        with open(config_path, 'r') as f:
+        with open(getattr(self, 'config_path', CONFIG_PATH), 'r') as f:
             config = yaml.safe_load(f)
             
         return config.get('default', 'mssql')
@@ -172,14 +301,34 @@ class Database:
         return url
         
     def get_engine(self):
-        """Get the default database engine."""
-        default_db = self._get_default_database()
-        if default_db not in self.engines:
-            config = self.configs[default_db]
-            url = self._build_connection_url(config)
-            self.engines[default_db] = create_engine(url)
-        return self.engines[default_db]
+        """Get the default database engine, shared with get_connection."""
+        return self.get_connection(self._get_default_database())
 
+    def get_inspector(self, database: Optional[str] = None) -> Any:
+        """Get a metadata inspector for a database.
+        
+        Inspectors cache the schema, table and column metadata they load, so
+        one is reused per engine for INSPECTOR_TTL seconds instead of querying
+        the catalog again on every request.
+        
+        Args:
+            database: Name of database to inspect
+            
+        Returns:
+            SQLAlchemy Inspector
+        """
+        engine = self.get_connection(database)
+        cached = self.inspectors.get(engine)
+        now = time.monotonic()
+        if cached is None or now - cached[1] > INSPECTOR_TTL:
+            cached = (inspect(engine), now)
+            self.inspectors[engine] = cached
+        return cached[0]
+    
+    def clear_metadata_cache(self) -> None:
+        """Drop cached inspectors so the next request reloads metadata after DDL changes."""
+        self.inspectors.clear()
+    
     def list_tables(self, database: Optional[str] = None, schema: Optional[str] = None) -> List[Dict]:
         """List all tables in the database.
         
@@ -191,15 +340,36 @@ class Database:
             List of tables with their schemas
         """
         engine = self.get_connection(database)
-        inspector = inspect(engine)
-        
         logger.info("Listing tables in database...")
-        tables = []
-        schema_names = inspector.get_schema_names()
-        logger.info(f"Found {len(schema_names)} schemas: {schema_names}")
         
+        # One catalog query lists every schema's tables where the dialect supports it
+        if engine.dialect.name in INFORMATION_SCHEMA_DIALECTS:
+            query = """
+                SELECT TABLE_SCHEMA, TABLE_NAME
+                FROM INFORMATION_SCHEMA.TABLES
+                WHERE TABLE_TYPE = 'BASE TABLE'
+                AND TABLE_SCHEMA NOT IN :system_schemas
+            """
+            params = {'system_schemas': list(SYSTEM_SCHEMAS)}
+            if schema:
+                query += " AND TABLE_SCHEMA = :schema"
+                params['schema'] = schema
+            query += " ORDER BY TABLE_SCHEMA, TABLE_NAME"
+            
+            statement = text(query).bindparams(bindparam('system_schemas', expanding=True))
+            with engine.connect() as conn:
+                rows = conn.execute(statement, params)
+                return [{'schema': row[0], 'table': row[1]} for row in rows]
+        
+        inspector = self.get_inspector(database)
+        tables = []
         if schema:
-            schema_names = [s for s in schema_names if s == schema]
+            # A requested schema is queried directly, without listing all schemas
+            schema_names = [schema]
+        else:
+            schema_names = inspector.get_schema_names()
+            logger.info(f"Found {len(schema_names)} schemas: {schema_names}")
+            schema_names = [s for s in schema_names if s not in SYSTEM_SCHEMAS]
         
         for schema_name in schema_names:
             for table_name in inspector.get_table_names(schema=schema_name):
@@ -220,8 +390,7 @@ class Database:
         Returns:
             Dictionary with table metadata
         """
-        engine = self.get_connection(database)
-        inspector = inspect(engine)
+        inspector = self.get_inspector(database)
         
         # Split schema and table name
         parts = table_name.split('.')
@@ -245,21 +414,171 @@ class Database:
             'columns': columns
         }
         
+    def iter_table(self, table_name: str, schema: str = 'dbo',
+                   database: Optional[str] = None,
+                   chunksize: int = READ_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """Read a table as a sequence of DataFrames of at most chunksize rows.
+        
+        Results are streamed from a server-side cursor where the driver
+        supports one, so rows are not buffered on the client before use.
+        
+        Args:
+            table_name: Name of table to read
+            schema: Schema name (default: dbo)
+            database: Name of database to query
+            chunksize: Rows per DataFrame
+            
+        Yields:
+            DataFrames holding consecutive batches of rows
+        """
+        engine = self.get_connection(database)
+        query = f"SELECT * FROM {schema}.{table_name}"
+        with engine.connect().execution_options(stream_results=True) as conn:
+            yield from pd.read_sql(text(query), conn, chunksize=chunksize)
+    
     def read_table(self, table_name: str, schema: str = 'dbo',
-                   database: Optional[str] = None) -> pd.DataFrame:
+                   database: Optional[str] = None,
+                   chunksize: int = READ_CHUNK_SIZE) -> pd.DataFrame:
         """Read data from a table into a pandas DataFrame.
         
         Args:
             table_name: Name of table to read
             schema: Schema name (default: dbo)
             database: Name of database to query
+            chunksize: Rows fetched per batch
             
         Returns:
             DataFrame containing table data
         """
+        # Fetch in batches and keep each one as a compact Arrow table, so only
+        # one batch at a time exists as Python objects; batches whose inferred
+        # types differ (e.g. int vs float after nulls) are promoted on concat
+        batches = []
+        for chunk in self.iter_table(table_name, schema, database, chunksize):
+            try:
+                batches.append(pa.Table.from_pandas(chunk, preserve_index=False))
+            except pa.ArrowException as e:
+                # Columns mixing Python types cannot be held in Arrow, so this
+                # batch alone stays a pandas frame
+                logger.warning(f"Keeping a batch of {schema}.{table_name} without Arrow: {e}")
+                batches.append(chunk)
+        
+        if not batches:
+            # pandas yields one empty chunk for an empty result, so this only
+            # runs for drivers that yield none; the column names come from the
+            # cached inspector rather than a second query
+            columns = self.get_inspector(database).get_columns(table_name, schema=schema)
+            return pd.DataFrame(columns=[column['name'] for column in columns])
+        if all(isinstance(batch, pa.Table) for batch in batches):
+            return pa.concat_tables(batches, promote_options="permissive").to_pandas()
+        return pd.concat([
+            batch.to_pandas() if isinstance(batch, pa.Table) else batch
+            for batch in batches
+        ], ignore_index=True)
+    
+    def profile_table(self, table_name: str, schema: str = 'dbo',
+                      database: Optional[str] = None) -> Dict[str, Any]:
+        """Compute per-column statistics inside the database.
+        
+        All reductions for all columns run as a single aggregate SELECT, so
+        only one result row is transferred instead of the whole table.
+        
+        Args:
+            table_name: Name of table to profile
+            schema: Schema name (default: dbo)
+            database: Name of database to query
+            
+        Returns:
+            Dictionary with total rows and per-column null, distinct and
+            (for numeric columns) min/max/mean/std statistics
+            
+        Raises:
+            ValueError: If a column type cannot be aggregated in SQL
+        """
         engine = self.get_connection(database)
-        query = f"SELECT * FROM {schema}.{table_name}"
-        return pd.read_sql(text(query), engine)
+        table = Table(table_name, MetaData(), schema=schema, autoload_with=engine)
+        dialect = engine.dialect.name
+        
+        aggregates = [func.count().label('total_rows')]
+        numeric_columns = set()
+        for i, column in enumerate(table.columns):
+            if isinstance(column.type, (LargeBinary, JSON, ARRAY)):
+                raise ValueError(f"Column {column.name} of type {column.type} cannot be profiled in SQL")
+            
+            # SQL Server estimates distinct counts far cheaper than it counts them
+            if dialect == 'mssql':
+                distinct_count = func.approx_count_distinct(column)
+            else:
+                distinct_count = func.count(distinct(column))
+            aggregates += [
+                func.count(column).label(f'non_null_{i}'),
+                distinct_count.label(f'distinct_{i}')
+            ]
+            
+            if isinstance(column.type, (Integer, Numeric)):
+                numeric_columns.add(i)
+                value = cast(column, Float)
+                stddev = func.stdev if dialect == 'mssql' else func.stddev_samp
+                aggregates += [
+                    func.min(value).label(f'min_{i}'),
+                    func.max(value).label(f'max_{i}'),
+                    func.avg(value).label(f'mean_{i}'),
+                    stddev(value).label(f'std_{i}')
+                ]
+        
+        with engine.connect() as conn:
+            row = conn.execute(select(*aggregates).select_from(table)).mappings().one()
+        
+        total_rows = row['total_rows']
+        columns = {}
+        for i, column in enumerate(table.columns):
+            stats = {
+                'data_type': str(column.type),
+                'null_count': total_rows - row[f'non_null_{i}'],
+                'unique_count': row[f'distinct_{i}']
+            }
+            if i in numeric_columns:
+                for key in ('min', 'max', 'mean', 'std'):
+                    value = row[f'{key}_{i}']
+                    stats[key] = None if value is None else float(value)
+            columns[column.name] = stats
+        
+        return {
+            'total_rows': total_rows,
+            'columns': columns
+        }
+    
+    def top_values(self, table_name: str, column: str, schema: str = 'dbo',
+                   database: Optional[str] = None, limit: int = 3) -> List[Dict[str, Any]]:
+        """Get the most frequent non-null values of a column with a GROUP BY query.
+        
+        Args:
+            table_name: Name of table to query
+            column: Column to count values of
+            schema: Schema name (default: dbo)
+            database: Name of database to query
+            limit: Number of values to return
+            
+        Returns:
+            List of value/count dictionaries, most frequent first
+        """
+        engine = self.get_connection(database)
+        value = column_clause(column)
+        frequency = func.count().label('frequency')
+        query = (
+            select(value, frequency)
+            .select_from(table_clause(table_name, value, schema=schema))
+            .where(value.isnot(None))
+            .group_by(value)
+            .order_by(frequency.desc())
+            .limit(limit)
+        )
+        
+        with engine.connect() as conn:
+            return [
+                {'value': row[0], 'count': row[1]}
+                for row in conn.execute(query)
+            ]
 
 # Global database instance
 db = Database()
@@ -26,7 +26,8 @@ class DataPreprocessor:
         """Initialize the preprocessor with a StandardScaler for normalization."""
         self.scaler = StandardScaler()
         
-    def normalize_numerical(self, data: pd.DataFrame) -> pd.DataFrame:
+    def normalize_numerical(self, data: pd.DataFrame,
+                            numerical_cols: Optional[pd.Index] = None) -> pd.DataFrame:
         """Normalize numerical columns in the dataset using StandardScaler.
         
         Applies standardization to numerical columns to ensure they have
@@ -35,16 +36,20 @@ class DataPreprocessor:
         
         Args:
             data (pd.DataFrame): Input data to normalize.
+            numerical_cols (pd.Index, optional): Precomputed numerical columns.
             
         Returns:
             pd.DataFrame: DataFrame with normalized numerical columns.
         """
-        numerical_cols = data.select_dtypes(include=[np.number]).columns
+        if numerical_cols is None:
+            numerical_cols = data.select_dtypes(include=[np.number]).columns
         if not numerical_cols.empty:
             data[numerical_cols] = self.scaler.fit_transform(data[numerical_cols])
         return data
     
-    def handle_missing_values(self, data: pd.DataFrame) -> pd.DataFrame:
+    def handle_missing_values(self, data: pd.DataFrame,
+                              numerical_columns: Optional[pd.Index] = None,
+                              categorical_columns: Optional[pd.Index] = None) -> pd.DataFrame:
         """Handle missing values in the dataset using appropriate strategies.
         
         Applies intelligent missing value imputation:
@@ -53,20 +58,29 @@ class DataPreprocessor:
         
         Args:
             data (pd.DataFrame): Input data with missing values.
+            numerical_columns (pd.Index, optional): Precomputed numerical columns.
+            categorical_columns (pd.Index, optional): Precomputed categorical columns.
             
         Returns:
             pd.DataFrame: DataFrame with missing values handled.
         """
-        numerical_columns = data.select_dtypes(include=[np.number]).columns
-        categorical_columns = data.select_dtypes(include=['object']).columns
+        if numerical_columns is None:
+            numerical_columns = data.select_dtypes(include=[np.number]).columns
+        if categorical_columns is None:
+            categorical_columns = data.select_dtypes(include=['object']).columns
         
         # Fill numerical columns with median
-        data[numerical_columns] = data[numerical_columns].fillna(data[numerical_columns].median())
+        fill_values = data[numerical_columns].median().to_dict()
         
-        # Fill categorical columns with mode
-        for col in categorical_columns:
-            data[col] = data[col].fillna(data[col].mode().iloc[0] if not data[col].mode().empty else 'Unknown')
+        # Fill categorical columns with mode, computed for all of them at once;
+        # columns without any value (NaN in the first mode row) get 'Unknown'
+        if not categorical_columns.empty:
+            modes = data[categorical_columns].mode()
+            first_modes = modes.iloc[0] if not modes.empty else pd.Series(index=categorical_columns, dtype=object)
+            fill_values.update(first_modes.reindex(categorical_columns).fillna('Unknown').to_dict())
         
+        # Both fills applied in a single pass
+        data.fillna(fill_values, inplace=True)
         return data
     
     def standardize_data_types(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -84,15 +98,22 @@ class DataPreprocessor:
         Returns:
             pd.DataFrame: DataFrame with standardized data types.
         """
-        for col in data.columns:
-            if pd.api.types.is_integer_dtype(data[col]):
-                data[col] = data[col].astype('int64')
-            elif pd.api.types.is_float_dtype(data[col]):
-                data[col] = data[col].astype('float64')
-            elif pd.api.types.is_bool_dtype(data[col]):
-                data[col] = data[col].astype('bool')
+        # Group columns by target type from the dtypes alone, then cast each
+        # group as one block
+        groups: Dict[str, List[str]] = {'int64': [], 'float64': [], 'bool': [], 'str': []}
+        for col, dtype in data.dtypes.items():
+            if pd.api.types.is_integer_dtype(dtype):
+                groups['int64'].append(col)
+            elif pd.api.types.is_float_dtype(dtype):
+                groups['float64'].append(col)
+            elif pd.api.types.is_bool_dtype(dtype):
+                groups['bool'].append(col)
             else:
-                data[col] = data[col].astype('str')
+                groups['str'].append(col)
+        
+        for target, cols in groups.items():
+            if cols:
+                data[cols] = data[cols].astype(target, copy=False)
         return data
     
     def process_data(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -109,7 +130,12 @@ class DataPreprocessor:
         Returns:
             pd.DataFrame: Fully preprocessed data ready for analysis.
         """
-        data = self.handle_missing_values(data)
-        data = self.normalize_numerical(data)
+        # Column groups are resolved once; filling missing values keeps every
+        # column's dtype, so they remain valid for normalization
+        numerical_cols = data.select_dtypes(include=[np.number]).columns
+        categorical_cols = data.select_dtypes(include=['object']).columns
+        
+        data = self.handle_missing_values(data, numerical_cols, categorical_cols)
+        data = self.normalize_numerical(data, numerical_cols)
         data = self.standardize_data_types(data)
         return data
@@ -1,29 +1,47 @@
 import great_expectations as ge
+from great_expectations.core import ExpectationSuite, ExpectationConfiguration
+from great_expectations.dataset import PandasDataset
 from .rule_parser import parse_rule
 
+def build_expectations(parsed):
+    col = parsed["column"]
+    if parsed["type"] == "not_null":
+        return [("expect_column_values_to_not_be_null", {"column": col})]
+    elif parsed["type"] == "range":
+        min_val, max_val = map(int, parsed["values"])
+        return [("expect_column_values_to_be_between", {"column": col, "min_value": min_val, "max_value": max_val})]
+    elif parsed["type"] == "not_empty":
+        return [
+            ("expect_column_values_to_not_be_null", {"column": col}),
+            ("expect_column_values_to_not_match_regex", {"column": col, "regex": r"^\s*$"})
+        ]
+    elif parsed["type"] == "greater_than":
+        return [("expect_column_values_to_be_between", {"column": col, "min_value": int(parsed["values"][0]), "strict_min": True})]
+    elif parsed["type"] == "less_than":
+        return [("expect_column_values_to_be_between", {"column": col, "max_value": int(parsed["values"][0]), "strict_max": True})]
+    return None
+
 def apply_expectations(df, rules):
-    ge_df = ge.from_pandas(df)
+    # Accept an already wrapped dataset so repeated runs skip the conversion
+    ge_df = df if isinstance(df, PandasDataset) else ge.from_pandas(df)
 
+    # Collect all expectations into one suite and validate it once, instead of
+    # evaluating each expectation interactively as it is added
+    suite = ExpectationSuite(expectation_suite_name="rules")
     for rule in rules:
         parsed = parse_rule(rule)
         if not parsed:
             print(f"Could not parse rule: {rule}")
             continue
 
-        col = parsed["column"]
-        if parsed["type"] == "not_null":
-            ge_df.expect_column_values_to_not_be_null(col)
-        elif parsed["type"] == "range":
-            min_val, max_val = map(int, parsed["values"])
-            ge_df.expect_column_values_to_be_between(col, min_value=min_val, max_value=max_val)
-        elif parsed["type"] == "not_empty":
-            ge_df.expect_column_values_to_not_be_null(col)
-            ge_df.expect_column_values_to_not_match_regex(col, r"^\s*$")
-        elif parsed["type"] == "greater_than":
-            ge_df.expect_column_values_to_be_greater_than(col, int(parsed["values"][0]))
-        elif parsed["type"] == "less_than":
-            ge_df.expect_column_values_to_be_less_than(col, int(parsed["values"][0]))
-        else:
+        expectations = build_expectations(parsed)
+        if expectations is None:
             print(f"Unknown expectation type for rule: {rule}")
+            continue
+
+        for expectation_type, kwargs in expectations:
+            suite.add_expectation(
+                ExpectationConfiguration(expectation_type=expectation_type, kwargs=kwargs)
+            )
 
-    return ge_df.validate()
+    return ge_df.validate(expectation_suite=suite)
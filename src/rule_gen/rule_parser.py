@@ -1,31 +1,18 @@
 import re
 
+# Rule patterns compiled once at import, tried in order
+PATTERNS = [
+    (re.compile(r"the '(.+)' column should not be null"), "not_null"),
+    (re.compile(r"the '(.+)' column should be between (\d+) and (\d+)"), "range"),
+    (re.compile(r"the '(.+)' column should not be empty"), "not_empty"),
+    (re.compile(r"the '(.+)' column should be greater than (\d+)"), "greater_than"),
+    (re.compile(r"the '(.+)' column should be less than (\d+)"), "less_than")
+]
+
 def parse_rule(rule: str):
     rule = rule.lower()
-    patterns = [
-        {
-            "pattern": r"the '(.+)' column should not be null",
-            "type": "not_null"
-        },
-        {
-            "pattern": r"the '(.+)' column should be between (\d+) and (\d+)",
-            "type": "range"
-        },
-        {
-            "pattern": r"the '(.+)' column should not be empty",
-            "type": "not_empty"
-        },
-        {
-            "pattern": r"the '(.+)' column should be greater than (\d+)",
-            "type": "greater_than"
-        },
-        {
-            "pattern": r"the '(.+)' column should be less than (\d+)",
-            "type": "less_than"
-        }
-    ]
-    for p in patterns:
-        match = re.search(p["pattern"], rule)
+    for pattern, rule_type in PATTERNS:
+        match = pattern.search(rule)
         if match:
-            return {"type": p["type"], "column": match.group(1), "values": match.groups()[1:]}
+            return {"type": rule_type, "column": match.group(1), "values": match.groups()[1:]}
     return None
@@ -0,0 +1,45 @@
+"""Shared pytest fixtures.
+
+src.database builds its global Database from a YAML config when imported, so
+a SQLite configuration is written and selected through DATABASE_CONFIG before
+any test module imports the package.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+
+ROOT_DIR = Path(__file__).parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+def write_sqlite_config(directory: Path) -> Path:
+    """Write a database.yaml whose default database is a SQLite file in directory."""
+    config_path = directory / 'database.yaml'
+    config = {
+        'default': 'sqlite',
+        'databases': {
+            'sqlite': {
+                'type': 'sqlite',
+                'host': '',
+                'database': str(directory / 'test.db')
+            }
+        }
+    }
+    config_path.write_text(yaml.safe_dump(config))
+    return config_path
+
+os.environ.setdefault('DATABASE_CONFIG', str(write_sqlite_config(Path(tempfile.mkdtemp()))))
+
+@pytest.fixture
+def database(tmp_path):
+    """A Database built through its constructor from a SQLite database.yaml."""
+    from src.database import Database
+    
+    database = Database(config_path=write_sqlite_config(tmp_path))
+    yield database
+    for engine in database.engines.values():
+        engine.dispose()
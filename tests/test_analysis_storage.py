@@ -0,0 +1,53 @@
+"""Tests for storing analysis results through the Database layer."""
+from datetime import datetime
+
+from sqlalchemy import text
+
+from src.analysis.storage.analysis_storage import AnalysisStorage
+
+def test_store_and_read_profiles(database):
+    """Single and batched profiles round-trip through the profiles table."""
+    storage = AnalysisStorage(database)
+    
+    profile_id = storage.store_profile_results(
+        {'summary': {'rows': 1}, 'columns': {'a': {'null_count': 0}}},
+        'sales', datetime(2024, 1, 1)
+    )
+    assert profile_id == 1
+    
+    storage.store_many_profiles([
+        {'profile_data': {'summary': {'rows': 2}, 'columns': {}},
+         'dataset_name': 'sales', 'timestamp': datetime(2024, 1, 2)},
+        {'profile_data': {'summary': {'rows': 3}, 'columns': {'b': {}}},
+         'dataset_name': 'orders', 'timestamp': datetime(2024, 1, 3)}
+    ])
+    
+    latest = storage.get_latest_profile('sales')
+    assert latest['id'] == 2
+    assert latest['summary'] == {'rows': 2}
+    assert storage.get_latest_profile('orders')['column_profiles'] == {'b': {}}
+    assert storage.get_latest_profile('missing') is None
+
+def test_store_and_read_anomalies(database):
+    """Anomaly results round-trip through the anomalies table."""
+    storage = AnalysisStorage(database)
+    
+    storage.store_anomaly_results(
+        {'summary': {'columns': 1}, 'column_anomalies': {'a': [1]}},
+        'sales', datetime(2024, 1, 1)
+    )
+    
+    latest = storage.get_latest_anomalies('sales')
+    assert latest['column_anomalies'] == {'a': [1]}
+    assert latest['new_values'] == {}
+
+def test_text_statements_use_named_binds(database):
+    """Plain SQL runs through text() with :name binds on every dialect."""
+    database.execute("CREATE TABLE items (name VARCHAR(20), qty INTEGER)")
+    database.executemany(
+        "INSERT INTO items (name, qty) VALUES (:name, :qty)",
+        [{'name': 'a', 'qty': 1}, {'name': 'b', 'qty': 2}]
+    )
+    
+    row = database.fetch_one(text("SELECT SUM(qty) FROM items WHERE name != :name"), {'name': 'c'})
+    assert row[0] == 3
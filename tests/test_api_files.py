@@ -0,0 +1,51 @@
+"""Tests for reading and storing uploaded files in the API.
+
+The app mounts static/ and uploads/ relative to the working directory, so
+these tests run from the repository root.
+"""
+import hashlib
+
+from fastapi.testclient import TestClient
+
+from src import api
+
+def test_read_json_file_pretty_printed_document(tmp_path):
+    """A pretty-printed document with a line starting '{' is not read as JSON Lines."""
+    path = tmp_path / "record.json"
+    path.write_text('{\n"a": 1,\n"b":\n{"c": "x"}\n}\n')
+    
+    df = api.read_json_file(str(path))
+    assert df["a"].tolist() == [1]
+    assert df["b.c"].tolist() == ["x"]
+
+def test_read_json_file_json_lines(tmp_path):
+    """Newline-delimited records are read as JSON Lines."""
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"a": 1}\n{"a": 2}\n{"a": 3}\n')
+    
+    assert api.read_json_file(str(path))["a"].tolist() == [1, 2, 3]
+
+def test_upload_names_file_by_content(tmp_path, monkeypatch):
+    """Uploads are named by content hash, and a repeated upload reuses the file."""
+    monkeypatch.setattr(api, "UPLOAD_DIR", str(tmp_path))
+    client = TestClient(api.app)
+    content = b"a,b\n1,2\n"
+    
+    first = client.post("/upload", files={"file": ("data.csv", content)}).json()
+    second = client.post("/upload", files={"file": ("data.csv", content)}).json()
+    
+    expected = f"{hashlib.sha256(content).hexdigest()[:16]}_data.csv"
+    assert first["filename"] == second["filename"] == expected
+    assert first["size"] == len(content)
+    assert (tmp_path / expected).read_bytes() == content
+    assert sorted(p.name for p in tmp_path.iterdir()) == [expected]
+
+def test_list_files_hides_dotfiles(tmp_path, monkeypatch):
+    """In-progress uploads and cache entries are not listed."""
+    monkeypatch.setattr(api, "UPLOAD_DIR", str(tmp_path))
+    (tmp_path / "data.csv").write_text("a\n1\n")
+    (tmp_path / ".upload.part").write_text("a\n")
+    (tmp_path / ".parquet_cache").mkdir()
+    
+    files = TestClient(api.app).get("/files").json()
+    assert [f["name"] for f in files] == ["data.csv"]
@@ -0,0 +1,45 @@
+"""Tests for the NumPy kernels and metrics of the legacy DataAnalyzer."""
+import numpy as np
+import pandas as pd
+
+from src.analysis.data_analyzer import DataAnalyzer, _fast_corr, _numeric_array
+
+def test_fast_corr_matches_pandas():
+    """The matrix-product correlation equals DataFrame.corr, constant columns included."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(200, 3)), columns=['a', 'b', 'c'])
+    df['d'] = df['a'] * 2 + rng.normal(scale=0.1, size=200)
+    df['const'] = 1.0
+    
+    pd.testing.assert_frame_equal(_fast_corr(df), df.corr(), atol=1e-12)
+    pd.testing.assert_frame_equal(_fast_corr(df, downcast=True), df.corr(), atol=1e-5)
+
+def test_fast_corr_with_missing_values_uses_pairwise_pandas():
+    """Missing values fall back to pandas' pairwise null handling."""
+    df = pd.DataFrame({'a': [1.0, 2.0, None, 4.0], 'b': [2.0, 4.1, 6.0, None]})
+    pd.testing.assert_frame_equal(_fast_corr(df), df.corr())
+
+def test_numeric_array_downcasts_only_when_exact():
+    """float32 is used only for small magnitudes with a meaningful spread."""
+    assert _numeric_array(pd.DataFrame({'a': [1.0, 2.0, 3.0]}), downcast=True).dtype == np.float32
+    assert _numeric_array(pd.DataFrame({'a': [1.0, 2.0 ** 25]}), downcast=True).dtype == np.float64
+    # A tiny spread around a large mean would cancel in float32
+    assert _numeric_array(pd.DataFrame({'a': [10000.0, 10000.001, 10000.002]}), downcast=True).dtype == np.float64
+    assert _numeric_array(pd.DataFrame({'a': [1.0, 2.0]})).dtype == np.float64
+
+def test_detect_anomalies_scores_in_float64():
+    """Anomaly scores returned to callers keep float64 precision."""
+    df = pd.DataFrame({'a': [1.0] * 20 + [50.0]})
+    result = DataAnalyzer().detect_anomalies(df, ['a'])
+    assert result['a_zscore'].dtype == np.float64
+    assert bool(result['a_is_anomaly'].iloc[-1])
+
+def test_analyze_data_quality_integer_column_labels():
+    """Frames with integer column labels, such as headerless CSVs, keep their labels."""
+    df = pd.DataFrame([[1, 'x', 2.5], [None, 'y', 3.5]])
+    metrics = DataAnalyzer().analyze_data_quality(df)
+    
+    assert metrics['missing_values_per_column'] == {0: 1, 1: 0, 2: 0}
+    assert metrics['unique_values_per_column'][0] == 1
+    assert set(metrics['numerical_statistics']) == {0, 2}
+    assert metrics['numerical_statistics'][2]['mean'] == 3.0
@@ -0,0 +1,77 @@
+"""Tests for the pandas to Polars conversion utilities."""
+import pandas as pd
+import polars as pl
+
+from src.analysis.utils.data_transformers import flatten_json, to_polars
+
+def test_flatten_json_expands_dict_and_list_columns():
+    """Dict keys and list lengths become columns aligned with their rows."""
+    df = pd.DataFrame({
+        'id': [1, 2, 3],
+        'meta': [{'a': 1, 'b': {'c': 2}}, None, {'a': 3}],
+        'tags': [['x', 'y'], [], None]
+    })
+    result = flatten_json(df)
+    
+    assert 'meta' not in result.columns and 'tags' not in result.columns
+    assert result['meta_a'].tolist()[0] == 1 and result['meta_a'].tolist()[2] == 3
+    assert pd.isna(result['meta_a'].tolist()[1])
+    assert result['meta_b_c'].tolist()[0] == 2
+    assert result['tags_length'].tolist()[:2] == [2, 0]
+    assert pd.isna(result['tags_length'].tolist()[2])
+    assert result['tags_items'].tolist()[0] == ['x', 'y']
+    # The caller's frame is left untouched
+    assert list(df.columns) == ['id', 'meta', 'tags']
+
+def test_flatten_json_keeps_scalars_mixed_with_dicts():
+    """Scalar values in a nested column are kept in a _value column."""
+    result = flatten_json(pd.DataFrame({'meta': [{'a': 1}, 'plain', None]}))
+    assert result['meta_value'].tolist()[1] == 'plain'
+    assert pd.isna(result['meta_value'].tolist()[0])
+    assert result['meta_a'].tolist()[0] == 1
+
+def test_flatten_json_returns_flat_frames_unchanged():
+    """Frames without nested values are returned as they are."""
+    df = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+    assert flatten_json(df) is df
+
+def test_to_polars_keeps_fractional_floats():
+    """Float columns with fractional values are never truncated to integers."""
+    result = to_polars(pd.DataFrame({'x': [1.5, 2.25, -3.75]}))
+    assert result.schema['x'] == pl.Float64
+    assert result['x'].to_list() == [1.5, 2.25, -3.75]
+
+def test_to_polars_narrows_integral_columns():
+    """Integral columns get the narrowest integer type holding their range."""
+    result = to_polars(pd.DataFrame({
+        'small': [1.0, 2.0, 3.0],
+        'large': [1, 2, 2 ** 40],
+        'missing': [1.0, None, 3.0]
+    }))
+    assert result.schema['small'] == pl.Int32
+    assert result['small'].to_list() == [1, 2, 3]
+    assert result.schema['large'] == pl.Int64
+    assert result['large'].to_list() == [1, 2, 2 ** 40]
+    assert result.schema['missing'] == pl.Float64
+    assert result['missing'].null_count() == 1
+
+def test_to_polars_splits_dates_from_datetimes():
+    """Datetime columns falling on midnight become dates; others keep their time."""
+    result = to_polars(pd.DataFrame({
+        'day': pd.to_datetime(['2024-01-01', '2024-01-02']),
+        'moment': pd.to_datetime(['2024-01-01 10:30:00', '2024-01-02 00:00:00'])
+    }))
+    assert result.schema['day'] == pl.Date
+    assert str(result['day'][1]) == '2024-01-02'
+    assert result.schema['moment'] == pl.Datetime('us')
+    assert result['moment'][0].hour == 10
+
+def test_to_polars_decodes_bytes_columns():
+    """Pure and mixed bytes columns are decoded to strings."""
+    result = to_polars(pd.DataFrame({
+        'raw': [b'a', b'b', None],
+        'mixed': [b'a', 'b', None]
+    }))
+    assert result.schema['raw'] == pl.Utf8
+    assert result['raw'].to_list() == ['a', 'b', None]
+    assert result['mixed'].to_list() == ['a', 'b', None]
@@ -0,0 +1,29 @@
+"""Tests for the quality metrics layouts served to the UI."""
+import pandas as pd
+
+from src.analysis.core.data_analyzer import DataAnalyzer
+
+def test_database_profile_matches_analyzer_layout():
+    """In-database metrics carry the same schema_info and column_stats keys as a full read."""
+    df = pd.DataFrame({'qty': [1.0, 2.0, None], 'name': ['a', 'a', 'b']})
+    expected = DataAnalyzer().analyze_data_quality(df)
+    
+    profile = {
+        'total_rows': 3,
+        'columns': {
+            'qty': {'data_type': 'INTEGER', 'null_count': 1, 'unique_count': 2,
+                    'mean': 1.5, 'std': 0.7071, 'min': 1.0, 'max': 2.0},
+            'name': {'data_type': 'VARCHAR(10)', 'null_count': 0, 'unique_count': 2}
+        }
+    }
+    top_values = {'name': [{'value': 'a', 'count': 2}, {'value': 'b', 'count': 1}]}
+    metrics = DataAnalyzer.from_database_profile(profile, top_values)
+    
+    assert set(metrics['schema_info']) == set(expected['schema_info'])
+    assert metrics['schema_info']['numeric_columns'] == ['qty']
+    assert metrics['schema_info']['string_columns'] == ['name']
+    for col in ('qty', 'name'):
+        assert set(metrics['column_stats'][col]) == set(expected['column_stats'][col])
+    assert metrics['column_stats']['name']['value_counts'] == expected['column_stats']['name']['value_counts']
+    assert metrics['column_stats']['qty']['null_percentage'] == expected['column_stats']['qty']['null_percentage']
+    assert 'data_quality_issues' in metrics
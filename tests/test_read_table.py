@@ -0,0 +1,17 @@
+"""Tests for reading whole tables through Database.read_table."""
+
+def test_read_table_keeps_unconvertible_batch(database):
+    """A batch Arrow cannot hold stays in pandas while the others use Arrow."""
+    database.execute("CREATE TABLE t (v)")
+    database.executemany("INSERT INTO t (v) VALUES (:v)", [{'v': 1}, {'v': 2}, {'v': 'a'}, {'v': 3}])
+    
+    df = database.read_table('t', schema='main', chunksize=2)
+    assert df['v'].tolist() == [1, 2, 'a', 3]
+
+def test_read_table_empty_keeps_columns(database):
+    """An empty table still returns its column names."""
+    database.execute("CREATE TABLE empty_t (a INTEGER, b TEXT)")
+    
+    df = database.read_table('empty_t', schema='main')
+    assert list(df.columns) == ['a', 'b']
+    assert df.empty